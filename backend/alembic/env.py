@@ -64,6 +64,14 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # Called from code with an open connection (e.g. test_query_plans.py): migrate that database
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     configuration = config.get_section(config.config_ini_section)
     configuration["sqlalchemy.url"] = settings.DATABASE_URL
     connectable = engine_from_config(
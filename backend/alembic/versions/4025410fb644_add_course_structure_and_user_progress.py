@@ -18,7 +18,73 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def create_course_tables() -> None:
+    """The course tables, which databases set up before migrations got from create_all at startup"""
+    existing = sa.inspect(op.get_bind()).get_table_names()
+    if 'courses' not in existing:
+        op.create_table('courses',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('language', sa.String(length=50), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=True),
+        sa.Column('difficulty_level', sa.String(length=20), nullable=True),
+        sa.Column('estimated_duration', sa.Integer(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_courses_id'), 'courses', ['id'], unique=False)
+    if 'modules' not in existing:
+        op.create_table('modules',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('order_index', sa.Integer(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_modules_id'), 'modules', ['id'], unique=False)
+    if 'user_progress' not in existing:
+        op.create_table('user_progress',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('lesson_id', sa.Integer(), nullable=False),
+        sa.Column('completed', sa.Boolean(), nullable=True),
+        sa.Column('completion_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('time_spent', sa.Integer(), nullable=True),
+        sa.Column('score', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['lesson_id'], ['lessons.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_user_progress_id'), 'user_progress', ['id'], unique=False)
+    if 'course_enrollments' not in existing:
+        op.create_table('course_enrollments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('enrolled_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('progress_percentage', sa.Float(), nullable=True),
+        sa.Column('certificate_issued', sa.Boolean(), nullable=True),
+        sa.Column('certificate_url', sa.String(length=500), nullable=True),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_course_enrollments_id'), 'course_enrollments', ['id'], unique=False)
+
+
 def upgrade() -> None:
+    create_course_tables()
     # ### commands auto generated by Alembic - please adjust! ###
     op.add_column('lessons', sa.Column('module_id', sa.Integer(), nullable=False))
     op.add_column('lessons', sa.Column('order_index', sa.Integer(), nullable=False))
@@ -0,0 +1,26 @@
+"""Add TTS job priority
+
+Revision ID: a7c3e5f19d24
+Revises: f3b8d1e6a952
+Create Date: 2026-10-17 16:22:47.118350
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e5f19d24'
+down_revision: Union[str, None] = 'f3b8d1e6a952'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tts_jobs', sa.Column('priority', sa.String(length=20), server_default='interactive', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('tts_jobs', 'priority')
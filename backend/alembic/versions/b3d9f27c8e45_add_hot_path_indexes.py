@@ -0,0 +1,65 @@
+"""Add hot path indexes
+
+Revision ID: b3d9f27c8e45
+Revises: a7c3e5f19d24
+Create Date: 2026-10-17 18:05:13.402917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d9f27c8e45'
+down_revision: Union[str, None] = 'a7c3e5f19d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name, table, columns, unique, partial on is_active
+INDEXES = [
+    ('ix_modules_course_active_order', 'modules', ['course_id', 'order_index'], False, True),
+    ('ix_lessons_module_active_order', 'lessons', ['module_id', 'order_index'], False, True),
+    ('uq_user_progress_user_lesson', 'user_progress', ['user_id', 'lesson_id'], True, False),
+    ('uq_course_enrollments_user_course', 'course_enrollments', ['user_id', 'course_id'], True, False),
+    ('ix_quiz_questions_quiz_active', 'quiz_questions', ['quiz_id'], False, True),
+    ('ix_quiz_responses_created_at', 'quiz_responses', ['created_at'], False, False),
+]
+
+# Rows that would violate the new unique indexes: (table, key columns, row to keep)
+DUPLICATES = [
+    ('user_progress', 'user_id, lesson_id', 'id DESC'),  # Latest progress wins
+    ('course_enrollments', 'user_id, course_id', 'id'),  # Earliest enrollment wins
+]
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name == 'postgresql'
+
+    # Duplicates left by racing requests would make the unique builds fail
+    for table, key, keep in DUPLICATES:
+        op.execute(
+            f'DELETE FROM {table} WHERE id IN ('
+            f'SELECT id FROM (SELECT id, row_number() OVER (PARTITION BY {key} ORDER BY {keep}) AS n '
+            f'FROM {table}) AS ranked WHERE n > 1)'
+        )
+
+    # CREATE INDEX CONCURRENTLY doesn't block writes but can't run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique, partial in INDEXES:
+            if postgres:
+                # A failed concurrent build leaves an invalid index behind; start over
+                op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+            op.create_index(
+                name, table, columns, unique=unique,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text('is_active = true') if partial else None,
+                sqlite_where=sa.text('is_active = 1') if partial else None,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
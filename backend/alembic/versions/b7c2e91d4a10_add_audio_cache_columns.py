@@ -0,0 +1,32 @@
+"""Add audio cache columns
+
+Revision ID: b7c2e91d4a10
+Revises: 4025410fb644
+Create Date: 2026-10-17 09:12:40.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c2e91d4a10'
+down_revision: Union[str, None] = '4025410fb644'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('audio_files', sa.Column('cache_key', sa.String(length=64), nullable=True))
+    op.add_column('audio_files', sa.Column('model_name', sa.String(length=255), nullable=True))
+    op.add_column('audio_files', sa.Column('last_accessed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+    op.create_index(op.f('ix_audio_files_cache_key'), 'audio_files', ['cache_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_audio_files_cache_key'), table_name='audio_files')
+    op.drop_column('audio_files', 'last_accessed_at')
+    op.drop_column('audio_files', 'model_name')
+    op.drop_column('audio_files', 'cache_key')
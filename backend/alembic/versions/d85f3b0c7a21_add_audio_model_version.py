@@ -0,0 +1,28 @@
+"""Add audio model version
+
+Revision ID: d85f3b0c7a21
+Revises: c41d8a6f2e93
+Create Date: 2026-10-17 11:20:07.382915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd85f3b0c7a21'
+down_revision: Union[str, None] = 'c41d8a6f2e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('audio_files', sa.Column('model_version', sa.String(length=300), nullable=True))
+    op.create_index(op.f('ix_audio_files_model_version'), 'audio_files', ['model_version'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_audio_files_model_version'), table_name='audio_files')
+    op.drop_column('audio_files', 'model_version')
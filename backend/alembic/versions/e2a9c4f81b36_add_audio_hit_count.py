@@ -0,0 +1,26 @@
+"""Add audio hit count
+
+Revision ID: e2a9c4f81b36
+Revises: d85f3b0c7a21
+Create Date: 2026-10-17 12:41:52.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9c4f81b36'
+down_revision: Union[str, None] = 'd85f3b0c7a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('audio_files', sa.Column('hit_count', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('audio_files', 'hit_count')
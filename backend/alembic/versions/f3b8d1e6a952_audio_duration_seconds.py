@@ -0,0 +1,30 @@
+"""Store real audio duration and generation time
+
+Revision ID: f3b8d1e6a952
+Revises: e2a9c4f81b36
+Create Date: 2026-10-17 14:08:31.517203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d1e6a952'
+down_revision: Union[str, None] = 'e2a9c4f81b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('audio_files', sa.Column('generation_time', sa.Float(), nullable=True))
+    # Existing durations are whole seconds of generation time, not audio length
+    op.execute('UPDATE audio_files SET generation_time = duration, duration = NULL')
+    op.alter_column('audio_files', 'duration', existing_type=sa.Integer(), type_=sa.Float(), existing_nullable=True)
+
+
+def downgrade() -> None:
+    op.alter_column('audio_files', 'duration', existing_type=sa.Float(), type_=sa.Integer(), existing_nullable=True)
+    op.drop_column('audio_files', 'generation_time')
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, desc, Integer
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
-from app.core.database import get_db
+from app.core.replicas import get_analytics_db
 from app.models.user import User
 from app.models.lesson import Lesson
 from app.models.quiz import Quiz, QuizResponse
@@ -14,7 +14,7 @@ from app.api.auth import get_current_admin_user
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 @router.get("/dashboard-stats")
-def get_dashboard_stats(db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+def get_dashboard_stats(db: Session = Depends(get_analytics_db), current_user: User = Depends(get_current_admin_user)):
     """Get overall dashboard statistics"""
     try:
         # User statistics
@@ -87,7 +87,7 @@ def get_dashboard_stats(db: Session = Depends(get_db), current_user: User = Depe
 @router.get("/user-analytics")
 def get_user_analytics(
     days: int = 30,
-    db: Session = Depends(get_db), 
+    db: Session = Depends(get_analytics_db), 
     current_user: User = Depends(get_current_admin_user)
 ):
     """Get user analytics over time"""
@@ -142,7 +142,7 @@ def get_user_analytics(
 
 @router.get("/course-analytics")
 def get_course_analytics(
-    db: Session = Depends(get_db), 
+    db: Session = Depends(get_analytics_db), 
     current_user: User = Depends(get_current_admin_user)
 ):
     """Get course analytics"""
@@ -216,7 +216,7 @@ def get_course_analytics(
 
 @router.get("/quiz-analytics")
 def get_quiz_analytics(
-    db: Session = Depends(get_db), 
+    db: Session = Depends(get_analytics_db), 
     current_user: User = Depends(get_current_admin_user)
 ):
     """Get quiz analytics"""
@@ -263,7 +263,7 @@ def get_quiz_analytics(
         raise HTTPException(status_code=500, detail=f"Error fetching quiz analytics: {str(e)}")
 
 @router.get("/user-count")
-def get_user_count(db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+def get_user_count(db: Session = Depends(get_analytics_db), current_user: User = Depends(get_current_admin_user)):
     """Get total user count for dashboard"""
     try:
         total_users = db.query(User).count()
@@ -0,0 +1,115 @@
+import os
+import re
+from typing import Optional, Tuple
+import anyio
+from fastapi import APIRouter, HTTPException, Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+from app.core.config import settings
+
+router = APIRouter()
+
+MEDIA_TYPES = {"wav": "audio/wav", "flac": "audio/flac", "ogg": "audio/ogg"}
+# The name hashes the request, not the bytes: evicted audio is re-rendered under the same name,
+# so caches must revalidate rather than keep a copy for good
+CACHE_CONTROL = "public, no-cache"
+CHUNK_SIZE = 64 * 1024
+
+_FILENAME = re.compile(r"^(?P<stem>[A-Za-z0-9_-]+)\.(?P<ext>wav|flac|ogg)$")
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class AudioFileResponse(Response):
+    """Sends a byte range of a file in chunks read off the event loop"""
+
+    def __init__(self, path: str, offset: int, count: int, status_code: int, headers: dict, media_type: str):
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+        self.path = path
+        self.offset = offset
+        self.count = count
+        self.headers["content-length"] = str(count)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"] == "HEAD" or self.count == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        async with await anyio.open_file(self.path, "rb") as f:
+            await f.seek(self.offset)
+            remaining = self.count
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single bytes range into inclusive (start, end); None means serve the whole file"""
+    match = _RANGE.match(header.strip())
+    if not match or (not match.group(1) and not match.group(2)):
+        return None
+    start, end = match.group(1), match.group(2)
+    if not start:
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError("Unsatisfiable range")
+    return start, end
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+@router.api_route("/audio/{filename}", methods=["GET", "HEAD"])
+def get_audio(filename: str, request: Request):
+    """Serve generated audio with Range support and ETag revalidation"""
+    match = _FILENAME.match(filename)
+    if not match:
+        raise HTTPException(status_code=404, detail="Audio file not found")
+
+    path = os.path.join(settings.AUDIO_OUTPUT_DIR, filename)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Audio file not found")
+
+    # Audio is only ever written to a temporary file and renamed into place, so a re-render is a
+    # new inode and mtime: tagging this version of the file keeps If-Range from mixing bytes of two
+    etag = f'"{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {"etag": etag, "cache-control": CACHE_CONTROL, "accept-ranges": "bytes"}
+    media_type = MEDIA_TYPES[match.group("ext")]
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    size = stat.st_size
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        try:
+            byte_range = _parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "content-range": f"bytes */{size}"})
+
+    if byte_range is None:
+        return AudioFileResponse(path, 0, size, 200, headers, media_type)
+
+    start, end = byte_range
+    headers["content-range"] = f"bytes {start}-{end}/{size}"
+    return AudioFileResponse(path, start, end - start + 1, 206, headers, media_type)
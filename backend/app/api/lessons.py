@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
+from app.core.replicas import get_read_db
 from app.services.lesson_service import LessonService
 from app.schemas.lesson import Lesson, LessonCreate, LessonUpdate
 
@@ -12,14 +13,14 @@ def get_lessons(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     language: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all lessons with optional filtering"""
     lessons = LessonService.get_lessons(db, skip=skip, limit=limit, language=language)
     return lessons 
 
 @router.get("/lessons/{lesson_id}", response_model=Lesson)
-def get_lesson(lesson_id: int, db: Session = Depends(get_db)):
+def get_lesson(lesson_id: int, db: Session = Depends(get_read_db)):
     """Get a specific lesson by ID"""
     lesson = LessonService.get_lesson(db, lesson_id=lesson_id)
     if lesson is None:
@@ -5,16 +5,17 @@ import os
 import uuid
 from datetime import datetime
 from typing import Optional
-import PyPDF2
 import io
 from app.api.auth import get_current_admin_user
 from app.models.user import User
 
 router = APIRouter(prefix="/pdf", tags=["pdf"])
 
-# Ensure upload directory exists
+# Created by the first upload
 UPLOAD_DIR = "app/static/uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+def list_uploads():
+    return os.listdir(UPLOAD_DIR) if os.path.isdir(UPLOAD_DIR) else []
 
 @router.post("/upload")
 async def upload_pdf(
@@ -38,6 +39,7 @@ async def upload_pdf(
         file_path = os.path.join(UPLOAD_DIR, filename)
         
         # Save file
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
         async with aiofiles.open(file_path, 'wb') as f:
             content = await file.read()
             await f.write(content)
@@ -72,7 +74,7 @@ async def extract_content(
     
     try:
         # Find the file in upload directory
-        for filename in os.listdir(UPLOAD_DIR):
+        for filename in list_uploads():
             if filename.startswith(file_id):
                 file_path = os.path.join(UPLOAD_DIR, filename)
                 break
@@ -103,7 +105,7 @@ async def delete_pdf(
     
     try:
         # Find and delete the file
-        for filename in os.listdir(UPLOAD_DIR):
+        for filename in list_uploads():
             if filename.startswith(file_id):
                 file_path = os.path.join(UPLOAD_DIR, filename)
                 os.remove(file_path)
@@ -116,6 +118,9 @@ async def delete_pdf(
 
 async def extract_pdf_content(pdf_content: bytes) -> str:
     """Extract text content from PDF bytes"""
+    # Imported on first use: only admins uploading PDFs need it, not every worker at startup
+    import PyPDF2
+
     try:
         # Create a PDF reader object
         pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
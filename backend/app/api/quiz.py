@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
+from app.core.replicas import get_read_db
 from app.services.quiz_service import QuizService
 from app.schemas.quiz import Quiz, QuizCreate, QuizQuestion, QuizResponse, QuizResponseCreate
 
@@ -12,14 +13,14 @@ def get_quizzes(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     language: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all quizzes with optional filtering"""
     quizzes = QuizService.get_quizzes(db, skip=skip, limit=limit, language=language)
     return quizzes
 
 @router.get("/quiz/{quiz_id}", response_model=Quiz)
-def get_quiz(quiz_id: int, db: Session = Depends(get_db)):
+def get_quiz(quiz_id: int, db: Session = Depends(get_read_db)):
     """Get a specific quiz by ID"""
     quiz = QuizService.get_quiz(db, quiz_id=quiz_id)
     if quiz is None:
@@ -27,13 +28,13 @@ def get_quiz(quiz_id: int, db: Session = Depends(get_db)):
     return quiz
 
 @router.get("/quiz/{quiz_id}/questions", response_model=List[QuizQuestion])
-def get_quiz_questions(quiz_id: int, db: Session = Depends(get_db)):
+def get_quiz_questions(quiz_id: int, db: Session = Depends(get_read_db)):
     """Get all questions for a specific quiz"""
     questions = QuizService.get_quiz_questions(db, quiz_id=quiz_id)
     return questions
 
 @router.get("/quiz/question/{question_id}", response_model=QuizQuestion)
-def get_question(question_id: int, db: Session = Depends(get_db)):
+def get_question(question_id: int, db: Session = Depends(get_read_db)):
     """Get a specific question by ID"""
     question = QuizService.get_question(db, question_id=question_id)
     if question is None:
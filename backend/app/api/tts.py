@@ -1,28 +1,148 @@
+from typing import Literal, Optional
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.memory import process_memory
+from app.api.auth import get_current_admin_user
+from app.models.user import User
 from app.services.tts_service import TTSService
-from app.schemas.tts import TTSRequest, TTSResponse
+from app.services.tts_jobs import job_host, QueueFullError
+from app.services.tts_models import ModelNotReadyError
+from app.services.tts_shards import shard_host
+from app.services.tts_scheduler import INTERACTIVE
+from app.schemas.tts import (
+    TTSRequest, TTSResponse, TTSJobResponse,
+    TTSBatchRequest, TTSBatchResponse, TTSBatchItemResult
+)
 
 router = APIRouter()
-tts_service = TTSService()
+# Requests never wait on a model load; they get a retryable 503 while it warms up
+tts_service = TTSService(wait_for_models=False)
+
+
+def model_not_ready(error: ModelNotReadyError) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(settings.TTS_NOT_READY_RETRY_AFTER)}
+    )
 
 @router.post("/tts", response_model=TTSResponse)
 def synthesize(request: TTSRequest, db: Session = Depends(get_db)):
     """Generate speech from text"""
     try:
+        if settings.TTS_SHARDED_WORKERS:
+            # Cache hits are answered here; only misses go to the language's shard
+            cached = tts_service.lookup(request=request, db=db)
+            if cached is not None:
+                return cached
+            return TTSResponse(**shard_host.synthesize(request))
         result = tts_service.synthesize(request=request, db=db)
         return result
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except ModelNotReadyError as e:
+        raise model_not_ready(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"TTS generation failed: {str(e)}")
 
+@router.post("/tts/batch", response_model=TTSBatchResponse)
+def synthesize_batch(
+    batch: TTSBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Generate speech for many texts at once, with per-item errors"""
+    if len(batch.items) > settings.TTS_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Batch is limited to {settings.TTS_BATCH_MAX_ITEMS} items")
+    try:
+        results = tts_service.synthesize_batch(requests=batch.items, db=db)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"TTS generation failed: {str(e)}")
+    return TTSBatchResponse(results=[
+        TTSBatchItemResult(index=index, result=result, error=error)
+        for index, (result, error) in enumerate(results)
+    ])
+
+@router.post("/tts/stream")
+def synthesize_stream(request: TTSRequest, db: Session = Depends(get_db)):
+    """Stream speech as WAV, sending audio as each sentence is synthesized"""
+    try:
+        chunks = tts_service.stream(request=request, db=db)
+    except ModelNotReadyError as e:
+        raise model_not_ready(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        chunks,
+        media_type="audio/wav",
+        headers={"X-Audio-Cache-Key": tts_service.cache_key(tts_service.stream_request(request))}
+    )
+
+@router.post("/tts/jobs", response_model=TTSJobResponse, status_code=202)
+def create_tts_job(
+    request: TTSRequest,
+    priority: Literal["interactive", "background"] = INTERACTIVE,
+    db: Session = Depends(get_db)
+):
+    """Queue speech generation and return immediately with a job id.
+
+    Background jobs (bulk prerendering, regeneration) run after queued
+    interactive ones but keep a guaranteed minimum share of the workers.
+    """
+    if request.language.lower() not in settings.SUPPORTED_LANGUAGES:
+        raise HTTPException(status_code=400, detail=f"Unsupported language: {request.language}")
+    try:
+        return job_host.create_job(db=db, request=request, priority=priority)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+@router.get("/tts/jobs/{job_id}", response_model=TTSJobResponse)
+def get_tts_job(job_id: str, db: Session = Depends(get_db)):
+    """Get the status and, once finished, the result of a TTS job"""
+    job = job_host.get_job(db=db, job_id=job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="TTS job not found")
+    return job
+
+@router.get("/tts/models")
+def get_loaded_models():
+    """List resident TTS models with their memory use and load times.
+
+    ``process`` reports this worker's memory split into pages shared with the
+    other workers (preloaded models) and pages unique to it.
+    """
+    return {
+        "memory_budget_bytes": tts_service.registry.memory_budget_bytes,
+        "resident_bytes": tts_service.registry.resident_bytes,
+        "models": tts_service.registry.loaded(),
+        "process": process_memory()
+    }
+
+@router.get("/tts/queue")
+def get_queue_status():
+    """Running and waiting synthesis work per priority, on this worker's models and in the server's job pool"""
+    return {"models": tts_service.registry.queues(), "jobs": job_host.status()}
+
+@router.get("/tts/shards")
+def get_shards():
+    """State, pinned CPUs and queue depth of each TTS shard process (sharded mode)"""
+    return {"enabled": settings.TTS_SHARDED_WORKERS, "shards": shard_host.status()}
+
 @router.get("/tts/cleanup")
-def cleanup_old_files(max_age_hours: int = 24, db: Session = Depends(get_db)):
-    """Clean up old audio files"""
+def cleanup_old_files(
+    max_age_hours: Optional[int] = None,
+    reconcile: bool = True,
+    db: Session = Depends(get_db)
+):
+    """Evict audio beyond the storage budget, expire files idle for max_age_hours and remove orphans"""
     try:
-        deleted_count = tts_service.cleanup_old_files(db=db, max_age_hours=max_age_hours)
-        return {"message": f"Cleaned up {deleted_count} old audio files"}
+        result = tts_service.cleanup(db=db, max_idle_hours=max_age_hours, reconcile=reconcile)
+        deleted_count = result["expired"] + result["evicted"] + result["orphan_files_removed"]
+        return {"message": f"Cleaned up {deleted_count} old audio files", **result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Cleanup failed: {str(e)}")
\ No newline at end of file
@@ -1,5 +1,25 @@
+import hashlib
+import json
 from functools import lru_cache
 
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace and case so trivially different texts share a key"""
+    return " ".join(text.split()).lower()
+
+
 @lru_cache(maxsize=128)
-def get_cached_audio_key(text: str, lang: str) -> str:
-    return f"{lang}:{text.strip().lower()}"
\ No newline at end of file
+def get_cached_audio_key(text: str, lang: str, model_name: str = "", **params) -> str:
+    """Content hash identifying one rendering of a text.
+
+    Any voice parameter that changes the produced audio must be passed in
+    ``params`` so that different renderings never share a key.
+    """
+    payload = {
+        "text": normalize_text(text),
+        "lang": lang.lower(),
+        "model": model_name,
+        "params": params,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
@@ -1,16 +1,170 @@
-from sqlalchemy import create_engine
+import time
+import uuid
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.core.metrics import metrics
 
-engine = create_engine(settings.DATABASE_URL)
+# Async drivers for the backends of DATABASE_URL
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """The same database as ``url``, addressed through an asyncio driver"""
+    url = make_url(url)
+    if url.get_dialect().is_async:
+        return url.render_as_string(hide_password=False)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)) \
+        .render_as_string(hide_password=False)
+
+
+class InstrumentedPool:
+    """Records checkout wait time, overflow connections and checkout timeouts of a queue pool"""
+
+    @property
+    def name(self) -> str:
+        return self._orig_logging_name or "default"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        overflow = self.overflow()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            metrics.inc("db_pool_timeouts", pool=self.name)
+            raise
+        finally:
+            metrics.observe("db_pool_checkout_seconds", time.perf_counter() - start, pool=self.name)
+        if self.overflow() > max(overflow, 0):
+            metrics.inc("db_pool_overflow", pool=self.name)
+        return record
+
+    def status(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+        }
+
+
+class InstrumentedQueuePool(InstrumentedPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(url: str, name: str, pool_size: int, max_overflow: int, statement_timeout_ms: int) -> dict:
+    """Pool and driver arguments shared by the sync and async engines"""
+    url = make_url(url)
+    connect_args = {}
+    if url.get_backend_name() == "sqlite":
+        if url.get_driver_name() == "pysqlite":
+            # SQLite (used by benchmarks) needs its connections shareable across threads
+            connect_args["check_same_thread"] = False
+    elif url.get_driver_name() == "asyncpg":
+        if settings.DB_PGBOUNCER:
+            # PgBouncer may run each transaction on a different server connection, so
+            # statements prepared on one are not there on the next
+            connect_args.update(
+                statement_cache_size=0,
+                prepared_statement_cache_size=0,
+                prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+            )
+        elif statement_timeout_ms:
+            connect_args["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+    elif statement_timeout_ms and not settings.DB_PGBOUNCER:
+        connect_args["options"] = f"-c statement_timeout={statement_timeout_ms}"
+
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_logging_name": name,
+        "connect_args": connect_args,
+    }
+
+
+def set_transaction_timeout(engine: Engine, statement_timeout_ms: int) -> None:
+    """Apply the statement timeout per transaction, where PgBouncer rejects it as a startup option"""
+    if not (settings.DB_PGBOUNCER and statement_timeout_ms and engine.dialect.name == "postgresql"):
+        return
+
+    @event.listens_for(engine, "begin")
+    def set_timeout(connection):
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(statement_timeout_ms)}")
+
+
+def make_engine(url: str, name: str, pool_size: int, max_overflow: int, statement_timeout_ms: int) -> Engine:
+    engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        **engine_options(url, name, pool_size, max_overflow, statement_timeout_ms)
+    )
+    set_transaction_timeout(engine, statement_timeout_ms)
+    return engine
+
+
+def make_async_engine(url: str, name: str, pool_size: int, max_overflow: int, statement_timeout_ms: int) -> AsyncEngine:
+    """Async engine for the same database as the sync ``url``"""
+    url = async_database_url(url)
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        **engine_options(url, name, pool_size, max_overflow, statement_timeout_ms)
+    )
+    set_transaction_timeout(engine.sync_engine, statement_timeout_ms)
+    return engine
+
+
+engine = make_engine(
+    settings.DATABASE_URL, "default",
+    settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.DB_STATEMENT_TIMEOUT_MS
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# For `async def` routes: queries await the driver instead of blocking the event loop
+async_engine = make_async_engine(
+    settings.ASYNC_DATABASE_URL or settings.DATABASE_URL, "async",
+    settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.DB_STATEMENT_TIMEOUT_MS
+)
+# Objects stay readable after commit; lazy loads would need a round trip outside the loop
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Admin reports scan whole tables; their own pool and a longer timeout keep them off learner connections
+analytics_engine = make_engine(
+    settings.DATABASE_URL, "analytics",
+    settings.DB_ANALYTICS_POOL_SIZE, settings.DB_ANALYTICS_MAX_OVERFLOW, settings.DB_ANALYTICS_STATEMENT_TIMEOUT_MS
+)
+AnalyticsSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=analytics_engine)
+
 Base = declarative_base()
 
+
+def sync_engines():
+    """Every engine of this process, as sync engines (for pool status and disposal after fork)"""
+    return [engine, async_engine.sync_engine, analytics_engine]
+
+
+def pool_status() -> dict:
+    return {e.pool.name: e.pool.status() for e in sync_engines()}
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,49 @@
+import os
+import sys
+from typing import Dict, List
+
+_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def process_memory(pid="self") -> Dict[str, int]:
+    """Resident memory of a process split into shared and unique bytes (Linux only)"""
+    values = {field: 0 for field in _FIELDS}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in values:
+                    values[name] = int(rest.split()[0]) * 1024
+    except (OSError, ValueError):
+        return {}
+    return {
+        "pid": os.getpid() if pid == "self" else int(pid),
+        "rss_bytes": values["Rss"],
+        "pss_bytes": values["Pss"],
+        "shared_bytes": values["Shared_Clean"] + values["Shared_Dirty"],
+        "unique_bytes": values["Private_Clean"] + values["Private_Dirty"],
+    }
+
+
+def child_pids(pid: int) -> List[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def report(master_pid: int) -> List[Dict[str, int]]:
+    """Memory of a server master process and each of its forked workers"""
+    return [stats for stats in (process_memory(pid) for pid in [master_pid] + child_pids(master_pid)) if stats]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m app.core.memory <master_pid>")
+        sys.exit(1)
+    mib = 1024 * 1024
+    print(f"{'pid':>8} {'rss MiB':>10} {'pss MiB':>10} {'shared MiB':>11} {'unique MiB':>11}")
+    for stats in report(int(sys.argv[1])):
+        print(f"{stats['pid']:>8} {stats['rss_bytes'] / mib:>10.1f} {stats['pss_bytes'] / mib:>10.1f} "
+              f"{stats['shared_bytes'] / mib:>11.1f} {stats['unique_bytes'] / mib:>11.1f}")
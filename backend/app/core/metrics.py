@@ -0,0 +1,106 @@
+import bisect
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Sequence, Tuple
+
+# Upper bounds in seconds, suited to everything from a file write to a long synthesis
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> dict:
+        # Cumulative counts per upper bound, as in the Prometheus exposition format
+        cumulative, buckets = 0, {}
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+
+class Metrics:
+    """Minimal in-process metrics registry, safe to use from worker threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, tuple], float] = defaultdict(float)
+        self._histograms: Dict[Tuple[str, tuple], Histogram] = {}
+
+    @staticmethod
+    def _key(name: str, labels: dict) -> Tuple[str, tuple]:
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        with self._lock:
+            self._counters[self._key(name, labels)] += value
+
+    def get(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(self._key(name, labels), 0)
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = DEFAULT_BUCKETS, **labels) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @staticmethod
+    def _label(labels: tuple) -> str:
+        return ",".join(f"{k}={v}" for k, v in labels) or "total"
+
+    def snapshot(self) -> dict:
+        counters: Dict[str, dict] = {}
+        histograms: Dict[str, dict] = {}
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                counters.setdefault(name, {})[self._label(labels)] = value
+            for (name, labels), histogram in self._histograms.items():
+                histograms.setdefault(name, {})[self._label(labels)] = histogram.to_dict()
+        return {"counters": counters, "histograms": histograms}
+
+
+class StageTimer:
+    """Wall-clock seconds spent in each named stage of one operation"""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - start
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] += seconds
+
+    def merge(self, timers, elapsed: float) -> None:
+        """Fold in timers of work done in parallel, scaled so they add up to the elapsed wall time"""
+        work = sum(timer.total for timer in timers)
+        scale = elapsed / work if work else 0.0
+        for timer in timers:
+            for name, seconds in timer.stages.items():
+                self.stages[name] += seconds * scale
+
+    @property
+    def total(self) -> float:
+        return sum(self.stages.values())
+
+
+metrics = Metrics()
@@ -0,0 +1,25 @@
+import os
+from sqlalchemy.engine import Engine
+
+# alembic/ next to the app package, wherever the server is started from
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic")
+
+
+class MigrationsPendingError(RuntimeError):
+    pass
+
+
+def check_migrations(engine: Engine) -> None:
+    """Raise MigrationsPendingError unless the database is at the latest Alembic revision"""
+    # Alembic is only needed when the check is enabled
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    heads = set(ScriptDirectory(MIGRATIONS_DIR).get_heads())
+    with engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+    if current != heads:
+        raise MigrationsPendingError(
+            f"Database is at revision {', '.join(sorted(current)) or 'none'}, expected "
+            f"{', '.join(sorted(heads))}; run `alembic upgrade head`"
+        )
@@ -0,0 +1,196 @@
+import threading
+import time
+from typing import List, Optional
+from fastapi import Request, Response
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.database import AnalyticsSessionLocal, AsyncSessionLocal, SessionLocal, make_async_engine, make_engine
+from app.core.metrics import metrics
+
+# Sent after a write and echoed back by the client: until then its reads go to the primary
+PRIMARY_UNTIL_HEADER = "X-DB-Primary-Until"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Whether the replica is streaming from the primary, and the seconds since it last applied the
+# primary's changes (0 when it has replayed everything it received). A replica whose WAL receiver
+# is down has replayed everything it received too, so the lag alone would call it fresh forever.
+# The receiver's status needs pg_read_all_stats; without it only a running receiver's pid shows
+REPLICATION_QUERY = text("""
+    SELECT
+        NOT pg_is_in_recovery()
+            OR coalesce((SELECT coalesce(status = 'streaming', pid IS NOT NULL) FROM pg_stat_wal_receiver), false),
+        CASE
+            WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END
+""")
+
+
+class Replica:
+    """One read replica with its own pools, mirroring the primary's engines"""
+
+    def __init__(self, index: int, url: str):
+        self.name = f"replica-{index}"
+        self.url = url
+        self.engine = make_engine(url, self.name, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW,
+                                  settings.DB_STATEMENT_TIMEOUT_MS)
+        self.async_engine = make_async_engine(url, f"{self.name}-async", settings.DB_POOL_SIZE,
+                                              settings.DB_MAX_OVERFLOW, settings.DB_STATEMENT_TIMEOUT_MS)
+        self.analytics_engine = make_engine(
+            url, f"{self.name}-analytics", settings.DB_ANALYTICS_POOL_SIZE, settings.DB_ANALYTICS_MAX_OVERFLOW,
+            settings.DB_ANALYTICS_STATEMENT_TIMEOUT_MS
+        )
+        self.healthy = False  # Unknown until the first check
+        self.lag: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def available(self) -> bool:
+        return self.healthy and self.lag is not None and self.lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+
+    def check(self) -> None:
+        try:
+            with self.engine.connect() as connection:
+                if connection.dialect.name == "postgresql":
+                    streaming, lag = connection.execute(REPLICATION_QUERY).one()
+                    if not streaming:
+                        raise RuntimeError("WAL receiver is not streaming from the primary")
+                    self.lag = float(lag or 0)
+                else:
+                    # No replication to measure (SQLite in development)
+                    connection.execute(text("SELECT 1"))
+                    self.lag = 0.0
+            self.healthy, self.error = True, None
+            metrics.observe("db_replica_lag_seconds", self.lag, replica=self.name)
+        except Exception as e:
+            if self.healthy:
+                print(f"Read replica {self.name} failed its health check: {e}")
+            self.healthy, self.error = False, str(e)
+            metrics.inc("db_replica_check_failures", replica=self.name)
+        self.checked_at = time.time()
+
+    def sync_engines(self):
+        return [self.engine, self.async_engine.sync_engine, self.analytics_engine]
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "available": self.available,
+            "lag_seconds": self.lag,
+            "checked_at": self.checked_at,
+            "error": self.error,
+        }
+
+
+class ReplicaSet:
+    """Routes read-only sessions to fresh replicas in turn, falling back to the primary.
+
+    A background thread checks every replica's health and replication lag
+    each ``check_interval`` seconds; replicas that failed the check or are
+    more than DB_REPLICA_MAX_LAG_SECONDS behind are skipped until a later
+    check finds them fresh again.
+    """
+
+    def __init__(self, urls: List[str], check_interval: float):
+        self.replicas = [Replica(index, url) for index, url in enumerate(urls)]
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._turn = 0
+        self._stop = threading.Event()
+        self._checker: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    @property
+    def read_your_writes_seconds(self) -> float:
+        # Long enough for any replica we would still route to to have caught up with the write
+        return settings.DB_REPLICA_MAX_LAG_SECONDS + self.check_interval
+
+    def check_all(self) -> None:
+        for replica in self.replicas:
+            replica.check()
+
+    def _run_checks(self):
+        while not self._stop.is_set():
+            self.check_all()
+            self._stop.wait(self.check_interval)
+
+    def start(self) -> None:
+        """Start health checks in this process (call after fork: threads don't survive it)"""
+        if self.enabled and self._checker is None:
+            self._stop.clear()
+            self._checker = threading.Thread(target=self._run_checks, name="db-replica-checks", daemon=True)
+            self._checker.start()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self._checker = None
+
+    def pick(self, request: Optional[Request] = None) -> Optional[Replica]:
+        """Next fresh replica in round-robin order, or None to read from the primary"""
+        if not self.enabled:
+            return None
+        if request is not None and self.reads_own_writes(request):
+            metrics.inc("db_reads", target="primary", reason="read_your_writes")
+            return None
+        available = [replica for replica in self.replicas if replica.available]
+        if not available:
+            metrics.inc("db_reads", target="primary", reason="no_replica")
+            return None
+        with self._lock:
+            replica = available[self._turn % len(available)]
+            self._turn += 1
+        metrics.inc("db_reads", target=replica.name)
+        return replica
+
+    @staticmethod
+    def reads_own_writes(request: Request) -> bool:
+        try:
+            return float(request.headers.get(PRIMARY_UNTIL_HEADER, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def mark_write(self, request: Request, response: Response) -> None:
+        """Tell the client to keep its reads on the primary until replicas have its write"""
+        if self.enabled and request.method in WRITE_METHODS and response.status_code < 400:
+            response.headers[PRIMARY_UNTIL_HEADER] = f"{time.time() + self.read_your_writes_seconds:.3f}"
+
+    def sync_engines(self):
+        return [engine for replica in self.replicas for engine in replica.sync_engines()]
+
+    def pool_status(self) -> dict:
+        return {e.pool.name: e.pool.status() for e in self.sync_engines()}
+
+    def status(self) -> List[dict]:
+        return [replica.to_dict() for replica in self.replicas]
+
+
+replicas = ReplicaSet(settings.DATABASE_REPLICA_URLS, settings.DB_REPLICA_CHECK_INTERVAL)
+
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints: a fresh replica when there is one, else the primary"""
+    replica = replicas.pick(request)
+    db = SessionLocal(bind=replica.engine) if replica else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request):
+    replica = replicas.pick(request)
+    async with (AsyncSessionLocal(bind=replica.async_engine) if replica else AsyncSessionLocal()) as db:
+        yield db
+
+def get_analytics_db(request: Request):
+    """Analytics session: the analytics pool of a replica, else of the primary"""
+    replica = replicas.pick(request)
+    db = AnalyticsSessionLocal(bind=replica.analytics_engine) if replica else AnalyticsSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
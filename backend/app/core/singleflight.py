@@ -0,0 +1,72 @@
+import os
+import threading
+import zlib
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; coalescing stays per process
+    fcntl = None
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Collapses concurrent calls for the same key into a single execution.
+
+    Within a process the first caller for a key runs the function and later
+    callers wait on its Future and receive the same result (or exception).
+    Across processes, ``lock(key)`` takes an exclusive file lock so only one
+    worker at a time does the work for a key; the others block and should
+    re-check their cache once they get the lock. Keys are hashed onto a fixed
+    number of lock files so the lock directory never grows.
+    """
+
+    def __init__(self, lock_dir: Optional[str] = None, stripes: int = 4096):
+        self.lock_dir = lock_dir
+        self.stripes = stripes
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """Run fn once per key among concurrent callers; returns (result, coalesced)"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    @contextmanager
+    def lock(self, key: str):
+        """Exclusive lock on a key shared by every process using the same lock_dir"""
+        if fcntl is None or not self.lock_dir:
+            yield
+            return
+        os.makedirs(self.lock_dir, exist_ok=True)
+        # crc32 rather than hash(): it must map a key to the same file in every process
+        stripe = zlib.crc32(key.encode("utf-8")) % self.stripes
+        with open(os.path.join(self.lock_dir, f"{stripe:04x}.lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
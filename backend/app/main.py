@@ -1,16 +1,15 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from app.api import tts, lessons, quiz, websocket, auth, courses, users, analytics, pdf_upload
+from app.api import tts, audio as audio_api, lessons, quiz, websocket, auth, courses, users, analytics, pdf_upload
 from app.core.config import settings
-from app.core.database import engine
-from app.models import lesson, quiz as quiz_models, user, audio
+from app.core.database import engine, pool_status
+from app.core.migrations import check_migrations
+from app.core.metrics import metrics
+from app.core.replicas import PRIMARY_UNTIL_HEADER, replicas
 
-# Create database tables
-lesson.Base.metadata.create_all(bind=engine)
-quiz_models.Base.metadata.create_all(bind=engine)
-user.Base.metadata.create_all(bind=engine)
-audio.Base.metadata.create_all(bind=engine)
+# Tables are created and changed by Alembic migrations (`alembic upgrade head`), not on import
 
 app = FastAPI(
     title="Road Safety Learning Platform",
@@ -25,8 +24,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[PRIMARY_UNTIL_HEADER],
 )
 
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    replicas.mark_write(request, response)
+    return response
+
 # Static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -34,6 +40,7 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 app.include_router(auth.router, tags=["Authentication"])
 app.include_router(courses.router, tags=["Courses"])
 app.include_router(tts.router, prefix="/api", tags=["TTS"])
+app.include_router(audio_api.router, prefix="/api", tags=["Audio"])
 app.include_router(lessons.router, prefix="/api", tags=["Lessons"])
 app.include_router(quiz.router, prefix="/api", tags=["Quiz"])
 app.include_router(websocket.router, tags=["WebSocket"])
@@ -41,6 +48,35 @@ app.include_router(users.router, prefix="/api", tags=["Users"])
 app.include_router(analytics.router, prefix="/api", tags=["Analytics"])
 app.include_router(pdf_upload.router, prefix="/api", tags=["PDF Upload"])
 
+@app.on_event("startup")
+def verify_migrations():
+    if settings.DB_CHECK_MIGRATIONS:
+        check_migrations(engine)
+
+@app.on_event("startup")
+def warm_up_tts_models():
+    # Runs in each worker; the server accepts requests while models load. Shards run once per
+    # server: under gunicorn the master has started them already and this is a no-op
+    if settings.TTS_SHARDED_WORKERS:
+        tts.shard_host.start()
+    elif settings.TTS_WARMUP_ON_STARTUP:
+        tts.tts_service.registry.warm_up_in_background(tts.tts_service.preload_languages())
+
+@app.on_event("startup")
+def start_tts_jobs():
+    # One job pool per server: under gunicorn the master has started it already and this is a no-op
+    tts.job_host.start()
+
+@app.on_event("startup")
+def start_replica_checks():
+    replicas.start()
+
+@app.on_event("shutdown")
+def shutdown_tts_workers():
+    tts.job_host.shutdown()
+    tts.shard_host.shutdown()
+    replicas.shutdown()
+
 @app.get("/")
 async def root():
     return {
@@ -51,4 +87,34 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/ready")
+def ready_check():
+    """Readiness probe: 503 until every startup TTS model is warmed or has failed for good"""
+    if settings.TTS_SHARDED_WORKERS:
+        ready = tts.shard_host.is_ready()
+        shards = tts.shard_host.status()
+        states = {shard["name"]: shard["state"] for shard in shards}
+        # As with in-process models, a shard that ran out of restarts is reported, not waited for
+        failed = [shard["name"] for shard in shards if shard["given_up"]]
+    else:
+        registry = tts.tts_service.registry
+        states = {language: registry.state(language) for language in settings.TTS_MODEL_MAP}
+        # A model that ran out of load attempts is reported, not waited for (later on-demand
+        # retries don't make the server unready again): the rest of the API still works
+        ready = not settings.TTS_WARMUP_ON_STARTUP or all(
+            language in registry.warmed or language in registry.given_up
+            for language in tts.tts_service.preload_languages()
+        )
+        failed = sorted(registry.given_up)
+    return JSONResponse(status_code=200 if ready else 503,
+                        content={"ready": ready, "languages": states, "failed": failed})
+
+@app.get("/metrics")
+def get_metrics():
+    return {
+        **metrics.snapshot(),
+        "db_pools": {**pool_status(), **replicas.pool_status()},
+        "db_replicas": replicas.status(),
+    }
\ No newline at end of file
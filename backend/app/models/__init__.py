@@ -1,9 +1,9 @@
 from .lesson import Course, Module, Lesson, UserProgress, CourseEnrollment
 from .quiz import Quiz, QuizQuestion, QuizResponse
 from .user import User
-from .audio import AudioFile
+from .audio import AudioFile, TTSJob
 
 __all__ = [
     "Course", "Module", "Lesson", "UserProgress", "CourseEnrollment",
-    "Quiz", "QuizQuestion", "QuizResponse", "User", "AudioFile"
+    "Quiz", "QuizQuestion", "QuizResponse", "User", "AudioFile", "TTSJob"
 ] 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, Float, String, DateTime, Text, JSON
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -11,8 +11,31 @@ class AudioFile(Base):
     language = Column(String(50), nullable=False)
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer)  # Size in bytes
-    duration = Column(Integer)  # Duration in seconds
+    duration = Column(Float)  # Length of the audio in seconds
+    generation_time = Column(Float)  # Seconds spent synthesizing
+    cache_key = Column(String(64), unique=True, index=True)  # Content hash of text, language, model and voice
+    model_name = Column(String(255))
+    model_version = Column(String(300), index=True)  # Model name and revision that rendered this file
+    last_accessed_at = Column(DateTime(timezone=True), server_default=func.now())
+    hit_count = Column(Integer, nullable=False, default=0, server_default="0")  # Cache hits since rendering
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     def __repr__(self):
-        return f"<AudioFile(id={self.id}, filename='{self.filename}', language='{self.language}')>" 
\ No newline at end of file
+        return f"<AudioFile(id={self.id}, filename='{self.filename}', language='{self.language}')>" 
+
+
+class TTSJob(Base):
+    __tablename__ = "tts_jobs"
+
+    id = Column(String(36), primary_key=True)  # uuid4
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, succeeded, failed
+    priority = Column(String(20), nullable=False, default="interactive", server_default="interactive")  # interactive, background
+    request = Column(JSON, nullable=False)  # Serialized TTSRequest
+    result = Column(JSON)  # Serialized TTSResponse once succeeded
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    def __repr__(self):
+        return f"<TTSJob(id='{self.id}', status='{self.status}')>"
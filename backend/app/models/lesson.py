@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -34,6 +34,12 @@ class Module(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # A course's active modules in order
+        Index("ix_modules_course_active_order", "course_id", "order_index",
+              postgresql_where=is_active == True, sqlite_where=is_active == True),
+    )
     
     # Relationships
     course = relationship("Course", back_populates="modules")
@@ -57,6 +63,12 @@ class Lesson(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # A module's active lessons in order
+        Index("ix_lessons_module_active_order", "module_id", "order_index",
+              postgresql_where=is_active == True, sqlite_where=is_active == True),
+    )
     
     # Relationships
     module = relationship("Module", back_populates="lessons")
@@ -77,6 +89,11 @@ class UserProgress(Base):
     score = Column(Float)  # for quiz scores
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # One progress row per user and lesson; also serves a user's progress list
+        Index("uq_user_progress_user_lesson", "user_id", "lesson_id", unique=True),
+    )
     
     # Relationships
     user = relationship("User", back_populates="progress")
@@ -96,6 +113,11 @@ class CourseEnrollment(Base):
     progress_percentage = Column(Float, default=0.0)
     certificate_issued = Column(Boolean, default=False)
     certificate_url = Column(String(500))
+
+    __table_args__ = (
+        # One enrollment per user and course; also serves a user's enrollment list
+        Index("uq_course_enrollments_user_course", "user_id", "course_id", unique=True),
+    )
     
     # Relationships
     user = relationship("User", back_populates="enrollments")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -38,6 +38,12 @@ class QuizQuestion(Base):
     question_type = Column(String(50), default="multiple_choice")  # multiple_choice, true_false, etc.
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # A quiz's active questions
+        Index("ix_quiz_questions_quiz_active", "quiz_id",
+              postgresql_where=is_active == True, sqlite_where=is_active == True),
+    )
     
     # Relationships
     quiz = relationship("Quiz", back_populates="questions")
@@ -55,7 +61,7 @@ class QuizResponse(Base):
     user_answer_index = Column(Integer, nullable=False)
     is_correct = Column(Boolean, nullable=False)
     response_time = Column(Integer)  # Time taken to answer in seconds
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)  # Recent activity reports
     
     # Relationships
     question = relationship("QuizQuestion", back_populates="responses")
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 from datetime import datetime
 
 class TTSRequest(BaseModel):
@@ -7,12 +7,42 @@ class TTSRequest(BaseModel):
     language: str
     voice_speed: Optional[float] = 1.0
     voice_pitch: Optional[float] = 1.0
+    voice: Optional[str] = None  # Named voice of multi-speaker models, see TTS_VOICES
+    output_format: Literal["wav", "flac", "ogg"] = "wav"
+    sample_rate: Optional[int] = Field(default=None, ge=8000, le=48000)  # Defaults to the model's native rate
+    keep_original: bool = False  # Also store the uncompressed native-rate WAV
 
 class TTSResponse(BaseModel):
     audio_url: str
     filename: str
-    duration: Optional[float] = None
+    duration: Optional[float] = None  # Audio length in seconds
     file_size: Optional[int] = None
+    generation_time: Optional[float] = None
+    cached: bool = False
+
+class TTSBatchRequest(BaseModel):
+    items: List[TTSRequest]
+
+class TTSBatchItemResult(BaseModel):
+    index: int
+    result: Optional[TTSResponse] = None
+    error: Optional[str] = None
+
+class TTSBatchResponse(BaseModel):
+    results: List[TTSBatchItemResult]
+
+class TTSJobResponse(BaseModel):
+    id: str
+    status: str
+    priority: str = "interactive"
+    result: Optional[TTSResponse] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
 
 class AudioFileBase(BaseModel):
     filename: str
@@ -23,7 +53,8 @@ class AudioFileBase(BaseModel):
 class AudioFile(AudioFileBase):
     id: int
     file_size: Optional[int] = None
-    duration: Optional[int] = None
+    duration: Optional[float] = None
+    generation_time: Optional[float] = None
     created_at: datetime
     
     class Config:
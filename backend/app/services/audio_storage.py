@@ -0,0 +1,163 @@
+import datetime
+import os
+import time
+from typing import Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.audio import AudioFile
+
+
+class AudioStorageManager:
+    """Keeps generated audio under a byte budget.
+
+    Every pass works in bounded batches: rows are fetched a page at a time in
+    eviction order (least recently used, then least hit) and each page is
+    deleted and committed before the next one is read, so memory use and
+    lock time stay flat however large the table grows.
+    """
+
+    def __init__(self, audio_dir: str, budget_bytes: int, batch_size: int, orphan_grace_seconds: int):
+        self.audio_dir = audio_dir
+        self.budget_bytes = budget_bytes
+        self.batch_size = batch_size
+        self.orphan_grace_seconds = orphan_grace_seconds
+
+    def usage(self, db: Session) -> int:
+        return db.query(func.coalesce(func.sum(AudioFile.file_size), 0)).scalar()
+
+    def enforce_budget(self, db: Session, keep_ids: Optional[List[int]] = None) -> int:
+        """Evict least recently used audio until total size fits the budget"""
+        total = self.usage(db)
+        evicted = 0
+        skipped: Set[int] = set(keep_ids or [])
+        while total > self.budget_bytes:
+            rows = db.query(AudioFile.id, AudioFile.file_path, AudioFile.file_size).filter(
+                AudioFile.id.notin_(skipped)
+            ).order_by(
+                AudioFile.last_accessed_at.asc(), AudioFile.hit_count.asc(), AudioFile.id.asc()
+            ).limit(self.batch_size).all()
+            if not rows:
+                break
+
+            batch = []
+            for row in rows:
+                if total <= self.budget_bytes:
+                    break
+                batch.append(row)
+                total -= row.file_size or 0
+            deleted, failed = self._delete(db, batch)
+            skipped.update(failed)
+            evicted += deleted
+
+        metrics.inc("tts_audio_evictions", evicted, reason="budget")
+        return evicted
+
+    def expire_idle(self, db: Session, max_idle_hours: int) -> int:
+        """Delete audio nobody has requested within the given window"""
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=max_idle_hours)
+        expired = 0
+        skipped: Set[int] = set()
+        while True:
+            rows = db.query(AudioFile.id, AudioFile.file_path, AudioFile.file_size).filter(
+                AudioFile.last_accessed_at < cutoff,
+                AudioFile.id.notin_(skipped)
+            ).order_by(AudioFile.id.asc()).limit(self.batch_size).all()
+            if not rows:
+                break
+            deleted, failed = self._delete(db, rows)
+            skipped.update(failed)
+            expired += deleted
+
+        metrics.inc("tts_audio_evictions", expired, reason="idle")
+        return expired
+
+    def reconcile(self, db: Session) -> Tuple[int, int]:
+        """Remove files on disk with no row and rows whose file is gone"""
+        return self._remove_orphan_files(db), self._remove_orphan_rows(db)
+
+    def _remove_orphan_files(self, db: Session) -> int:
+        if not os.path.isdir(self.audio_dir):
+            return 0
+        removed = 0
+        for chunk in self._scan_chunks():
+            names = {entry.name for entry in chunk}
+            known = {
+                row.filename for row in
+                db.query(AudioFile.filename).filter(AudioFile.filename.in_(names))
+            }
+            # Recent files may belong to a rendering whose row is not committed yet
+            cutoff = time.time() - self.orphan_grace_seconds
+            for entry in chunk:
+                if entry.name in known:
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"Failed to remove orphan audio {entry.name}: {e}")
+
+        metrics.inc("tts_audio_orphans_removed", removed, kind="file")
+        return removed
+
+    def _scan_chunks(self) -> Iterable[List[os.DirEntry]]:
+        """Stream the audio directory in bounded chunks instead of listing it at once"""
+        chunk: List[os.DirEntry] = []
+        with os.scandir(self.audio_dir) as entries:
+            for entry in entries:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                chunk.append(entry)
+                if len(chunk) >= self.batch_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    def _remove_orphan_rows(self, db: Session) -> int:
+        removed = 0
+        last_id = 0
+        while True:
+            rows = db.query(AudioFile.id, AudioFile.file_path).filter(
+                AudioFile.id > last_id
+            ).order_by(AudioFile.id.asc()).limit(self.batch_size).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            missing = [row.id for row in rows if not os.path.exists(row.file_path)]
+            if missing:
+                db.query(AudioFile).filter(AudioFile.id.in_(missing)).delete(synchronize_session=False)
+                db.commit()
+                removed += len(missing)
+
+        metrics.inc("tts_audio_orphans_removed", removed, kind="row")
+        return removed
+
+    def _delete(self, db: Session, rows) -> Tuple[int, List[int]]:
+        """Delete files then their rows in one commit; returns (deleted, failed ids)"""
+        deleted_ids, failed_ids = [], []
+        for row in rows:
+            try:
+                os.remove(row.file_path)
+                deleted_ids.append(row.id)
+            except FileNotFoundError:
+                deleted_ids.append(row.id)
+            except OSError as e:
+                print(f"Failed to delete audio {row.file_path}: {e}")
+                failed_ids.append(row.id)
+        if deleted_ids:
+            db.query(AudioFile).filter(AudioFile.id.in_(deleted_ids)).delete(synchronize_session=False)
+            db.commit()
+        return len(deleted_ids), failed_ids
+
+
+audio_storage = AudioStorageManager(
+    audio_dir=settings.AUDIO_OUTPUT_DIR,
+    budget_bytes=settings.TTS_AUDIO_CACHE_MAX_BYTES,
+    batch_size=settings.TTS_AUDIO_EVICTION_BATCH_SIZE,
+    orphan_grace_seconds=settings.TTS_ORPHAN_GRACE_SECONDS,
+)
@@ -0,0 +1,101 @@
+import struct
+import wave
+from math import gcd
+from typing import Optional
+import numpy as np
+import soundfile as sf
+
+PCM_SAMPLE_WIDTH = 2  # 16-bit mono
+_UNKNOWN_SIZE = 0xFFFFFFFF
+
+# Output format -> (libsndfile container, subtype)
+AUDIO_FORMATS = {
+    "wav": ("WAV", "PCM_16"),
+    "flac": ("FLAC", "PCM_16"),
+    "ogg": ("OGG", "VORBIS"),
+}
+
+
+def resample(samples, source_rate: int, target_rate: Optional[int]) -> np.ndarray:
+    """Polyphase resampling; returns the input unchanged when no rate is requested"""
+    audio = np.asarray(samples, dtype=np.float32)
+    if not target_rate or target_rate == source_rate:
+        return audio
+    from scipy.signal import resample_poly
+    divisor = gcd(source_rate, target_rate)
+    return resample_poly(audio, target_rate // divisor, source_rate // divisor).astype(np.float32)
+
+
+def concatenate(pieces, sample_rate: int, pause_ms: int) -> np.ndarray:
+    """Join audio pieces with a fixed silence between consecutive pieces"""
+    pause = np.zeros(int(sample_rate * pause_ms / 1000), dtype=np.float32)
+    joined = []
+    for index, piece in enumerate(pieces):
+        if index:
+            joined.append(pause)
+        joined.append(np.asarray(piece, dtype=np.float32))
+    return np.concatenate(joined) if joined else np.zeros(0, dtype=np.float32)
+
+
+def trim_silence(samples, sample_rate: int, threshold_db: float = -45.0, keep_ms: int = 30) -> np.ndarray:
+    """Cut leading and trailing audio quieter than threshold_db, keeping a short margin"""
+    audio = np.asarray(samples, dtype=np.float32)
+    frame = max(sample_rate // 100, 1)  # 10ms frames
+    count = len(audio) // frame
+    if count == 0:
+        return audio
+    rms = np.sqrt(np.mean(audio[:count * frame].reshape(count, frame) ** 2, axis=1))
+    loud = np.nonzero(rms > 10 ** (threshold_db / 20))[0]
+    if len(loud) == 0:
+        return audio
+    keep = int(sample_rate * keep_ms / 1000)
+    return audio[max(loud[0] * frame - keep, 0):min((loud[-1] + 1) * frame + keep, len(audio))]
+
+
+def normalize_loudness(samples, target_dbfs: float, peak: float = 0.99) -> np.ndarray:
+    """Scale audio to a target RMS level in dBFS, limited so that peaks never clip"""
+    audio = np.asarray(samples, dtype=np.float32)
+    rms = float(np.sqrt(np.mean(audio ** 2))) if len(audio) else 0.0
+    if rms < 1e-6:
+        return audio
+    gain = min(10 ** (target_dbfs / 20) / rms, peak / float(np.max(np.abs(audio))))
+    return audio * np.float32(gain)
+
+
+def write_audio(path: str, samples, sample_rate: int, output_format: str = "wav") -> None:
+    """Encode float samples to a file in one of AUDIO_FORMATS"""
+    container, subtype = AUDIO_FORMATS[output_format]
+    audio = np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0)
+    sf.write(path, audio, sample_rate, format=container, subtype=subtype)
+
+
+def to_pcm16(samples) -> bytes:
+    """Convert float samples in [-1, 1] to little-endian 16-bit PCM"""
+    audio = np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0)
+    return (audio * 32767).astype("<i2").tobytes()
+
+
+def silence_pcm16(sample_rate: int, milliseconds: int) -> bytes:
+    return b"\x00" * (int(sample_rate * milliseconds / 1000) * PCM_SAMPLE_WIDTH)
+
+
+def wav_stream_header(sample_rate: int) -> bytes:
+    """WAV header for a stream whose length is not known up front.
+
+    The RIFF and data sizes are set to the maximum value, which players treat
+    as "read until the connection closes".
+    """
+    byte_rate = sample_rate * PCM_SAMPLE_WIDTH
+    return b"".join([
+        b"RIFF", struct.pack("<I", _UNKNOWN_SIZE), b"WAVE",
+        b"fmt ", struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, byte_rate, PCM_SAMPLE_WIDTH, 16),
+        b"data", struct.pack("<I", _UNKNOWN_SIZE),
+    ])
+
+
+def write_wav(path: str, pcm: bytes, sample_rate: int) -> None:
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(PCM_SAMPLE_WIDTH)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm)
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.lesson import Lesson
 from app.schemas.lesson import LessonCreate, LessonUpdate
+from app.services.prerender_service import PrerenderService
 from typing import List, Optional
 
 class LessonService:
@@ -21,6 +22,7 @@ class LessonService:
         db.add(db_lesson)
         db.commit()
         db.refresh(db_lesson)
+        PrerenderService.enqueue_lesson(db, db_lesson)
         return db_lesson
     
     @staticmethod
@@ -32,6 +34,8 @@ class LessonService:
                 setattr(db_lesson, field, value)
             db.commit()
             db.refresh(db_lesson)
+            if {"content", "language"} & update_data.keys():
+                PrerenderService.enqueue_lesson(db, db_lesson)
         return db_lesson
     
     @staticmethod
@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+import uuid
+from typing import Optional
+import numpy as np
+import soundfile as sf
+from app.core.metrics import metrics
+
+
+class PhraseCache:
+    """Sentence-level audio cache on disk.
+
+    Each sentence is stored once per model version and voice as a 16-bit
+    WAV named by its content hash, so sentences shared across lessons or
+    left untouched by an edit are never synthesized twice. Files are spread
+    over 256 subdirectories and evicted oldest-used first once the cache
+    grows past its byte budget.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.wav")
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        path = self._path(key)
+        try:
+            samples, _ = sf.read(path, dtype="float32")
+        except (OSError, RuntimeError):
+            metrics.inc("tts_phrase_cache_misses")
+            return None
+        try:
+            # mtime doubles as last-used time for eviction
+            os.utime(path)
+        except OSError:
+            pass
+        metrics.inc("tts_phrase_cache_hits")
+        return samples
+
+    def put(self, key: str, samples, sample_rate: int) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            sf.write(tmp_path, np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0),
+                     sample_rate, format="WAV", subtype="PCM_16")
+            os.replace(tmp_path, path)
+            added = os.path.getsize(path)
+        except OSError as e:
+            print(f"Failed to cache phrase {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += added
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def _scan_size(self) -> int:
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+    def evict(self, target_ratio: float = 0.9) -> int:
+        """Delete least recently used phrases until the cache is under target_ratio of its budget"""
+        with self._lock:
+            entries = []
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * target_ratio
+            # Leave files from in-flight writes alone
+            cutoff = time.time() - 60
+
+            evicted = 0
+            for mtime, size, path in sorted(entries):
+                if total <= target:
+                    break
+                if path.endswith(".tmp") and mtime > cutoff:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                    evicted += 1
+                except OSError:
+                    pass
+            self._size = total
+
+        metrics.inc("tts_phrase_cache_evictions", evicted)
+        return evicted
@@ -0,0 +1,61 @@
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.audio import AudioFile
+from app.models.lesson import Lesson
+from app.models.quiz import QuizQuestion
+from app.schemas.tts import TTSRequest
+from app.services.tts_jobs import job_host, QueueFullError
+from app.services.tts_scheduler import BACKGROUND
+from app.services.tts_service import TTSService
+from typing import List
+
+class PrerenderService:
+    """Voices lesson and quiz text ahead of time so learners hit the audio cache"""
+
+    @staticmethod
+    def lesson_requests(lesson: Lesson) -> List[TTSRequest]:
+        if not lesson.content or not lesson.content.strip():
+            return []
+        return [TTSRequest(text=lesson.content, language=lesson.language)]
+
+    @staticmethod
+    def question_requests(question: QuizQuestion, language: str) -> List[TTSRequest]:
+        texts = [question.question_text] + list(question.options or [])
+        return [TTSRequest(text=text, language=language) for text in texts if text and text.strip()]
+
+    @staticmethod
+    def missing(db: Session, requests: List[TTSRequest]) -> List[TTSRequest]:
+        """Requests whose audio for the current model version is not cached yet"""
+        requests = [r for r in requests if r.language.lower() in settings.SUPPORTED_LANGUAGES]
+        keys = {TTSService.cache_key(request): request for request in requests}
+        if not keys:
+            return []
+        existing = {
+            row.cache_key for row in
+            db.query(AudioFile.cache_key).filter(AudioFile.cache_key.in_(list(keys)))
+        }
+        return [request for key, request in keys.items() if key not in existing]
+
+    @staticmethod
+    def enqueue(db: Session, requests: List[TTSRequest]) -> int:
+        """Queue background jobs for uncached requests; the backfill CLI catches anything skipped"""
+        if not settings.TTS_PRERENDER_ENABLED:
+            return 0
+        queued = 0
+        try:
+            for request in PrerenderService.missing(db, requests):
+                job_host.create_job(db=db, request=request, priority=BACKGROUND)
+                queued += 1
+        except QueueFullError:
+            print("TTS job queue full, remaining pre-render requests skipped")
+        except Exception as e:
+            print(f"Failed to queue pre-render jobs: {e}")
+        return queued
+
+    @staticmethod
+    def enqueue_lesson(db: Session, lesson: Lesson) -> int:
+        return PrerenderService.enqueue(db, PrerenderService.lesson_requests(lesson))
+
+    @staticmethod
+    def enqueue_question(db: Session, question: QuizQuestion) -> int:
+        return PrerenderService.enqueue(db, PrerenderService.question_requests(question, question.quiz.language))
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.quiz import Quiz, QuizQuestion, QuizResponse
 from app.schemas.quiz import QuizCreate, QuizUpdate, QuizQuestionCreate, QuizResponseCreate
+from app.services.prerender_service import PrerenderService
 from typing import List, Optional
 
 class QuizService:
@@ -65,4 +66,5 @@ class QuizService:
         db.add(db_question)
         db.commit()
         db.refresh(db_question)
+        PrerenderService.enqueue_question(db, db_question)
         return db_question
@@ -0,0 +1,99 @@
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing.managers import BaseManager
+from typing import Optional, Type
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Authkey of a host process, handed to it through the environment
+AUTHKEY_ENV = "TTS_HOST_AUTHKEY"
+
+
+def serve(manager_class: Type[BaseManager], address: str) -> None:
+    """Host process: serve the manager's objects to the web workers until terminated"""
+    # SIGTERM exits normally, so atexit handlers shut the host's own processes down
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    manager = manager_class(address=address, authkey=bytes.fromhex(os.environ[AUTHKEY_ENV]))
+    manager.get_server().serve_forever()
+
+
+class ProcessHost:
+    """An object shared by all of the server's workers, living in a host process.
+
+    The host process (``python -m <module> <address>``) is started once: by
+    the gunicorn master in ``when_ready``, before workers fork, or at startup
+    when a single process serves the app. Forked workers inherit its socket
+    address and authkey and call the object through a manager proxy (one
+    connection per thread), so every worker shares the same state and bounds.
+    """
+
+    def __init__(self, name: str, module: str, manager_class: Type[BaseManager], typeid: str,
+                 start_timeout: float = 30.0):
+        self.name = name
+        self.module = module
+        self.manager_class = manager_class
+        self.typeid = typeid
+        self.start_timeout = start_timeout
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+        self._owner_pid: Optional[int] = None
+        self._address: Optional[str] = None
+        self._authkey: Optional[bytes] = None
+        self._proxy = None
+        self._proxy_pid: Optional[int] = None
+
+    @property
+    def started(self) -> bool:
+        return self._address is not None
+
+    def start(self) -> None:
+        """Start the host unless this process started it or inherited it from its parent"""
+        with self._lock:
+            if self._address is not None:
+                return
+            address = os.path.join(tempfile.mkdtemp(prefix=f"tts-{self.name}-"), "host.sock")
+            authkey = os.urandom(32)
+            process = subprocess.Popen(
+                [sys.executable, "-m", self.module, address],
+                cwd=BACKEND_DIR,
+                env={**os.environ, AUTHKEY_ENV: authkey.hex()},
+            )
+            deadline = time.monotonic() + self.start_timeout
+            while not os.path.exists(address):
+                if process.poll() is not None or time.monotonic() > deadline:
+                    process.kill()
+                    raise RuntimeError(f"TTS {self.name} host failed to start")
+                time.sleep(0.05)
+            self._process, self._owner_pid = process, os.getpid()
+            self._address, self._authkey = address, authkey
+
+    def proxy(self):
+        """Proxy of the hosted object, connected once per process"""
+        with self._lock:
+            if self._proxy is None or self._proxy_pid != os.getpid():
+                if self._address is None:
+                    raise RuntimeError(f"TTS {self.name} host is not running")
+                manager = self.manager_class(address=self._address, authkey=self._authkey)
+                manager.connect()
+                self._proxy, self._proxy_pid = getattr(manager, self.typeid)(), os.getpid()
+            return self._proxy
+
+    def shutdown(self) -> None:
+        """Stop the host and its processes; a no-op outside the process that started it"""
+        with self._lock:
+            self._proxy = None
+            if self._process is None or self._owner_pid != os.getpid():
+                return
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            shutil.rmtree(os.path.dirname(self._address), ignore_errors=True)
+            self._process = self._address = self._authkey = None
@@ -0,0 +1,309 @@
+import atexit
+import datetime
+import multiprocessing
+import sys
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.managers import BaseManager
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.models.audio import TTSJob
+from app.schemas.tts import TTSRequest
+from app.services.tts_host import ProcessHost, serve
+from app.services.tts_scheduler import INTERACTIVE, PriorityScheduler
+
+# Each synthesis worker process builds its own service (and models) once
+_worker_service = None
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity and the caller should retry later"""
+
+
+def _init_worker():
+    global _worker_service
+    from app.services.tts_service import TTSService
+    _worker_service = TTSService()
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def run_job(job_id: str) -> None:
+    """Execute one queued job inside a worker process and persist its outcome"""
+    db = SessionLocal()
+    try:
+        # Claimed atomically: the job may have expired, or been taken over by another server's host
+        claimed = db.query(TTSJob).filter(TTSJob.id == job_id, TTSJob.status == "queued").update(
+            {TTSJob.status: "running", TTSJob.started_at: _now()}, synchronize_session=False
+        )
+        db.commit()
+        if not claimed:
+            return
+        job = db.query(TTSJob).filter(TTSJob.id == job_id).first()
+
+        try:
+            result = _worker_service.synthesize(request=TTSRequest(**job.request), db=db, priority=job.priority)
+            job.result = result.model_dump()
+            job.status = "succeeded"
+        except Exception as e:
+            db.rollback()
+            job.error = str(e)
+            job.status = "failed"
+        job.finished_at = _now()
+        db.commit()
+    finally:
+        db.close()
+
+
+class TTSJobQueue:
+    """Bounded pool of synthesis processes running outside the web workers.
+
+    One queue serves the whole server, from the job host process (see
+    ``TTSJobHost``). At most ``max_workers`` jobs synthesize at once; up to
+    ``max_pending`` jobs may be queued or running before new submissions are
+    refused. Queued jobs are dispatched to the pool by priority: interactive
+    jobs ahead of background ones, which keep a guaranteed minimum share.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.scheduler = PriorityScheduler(
+            "jobs",
+            slots=max_workers,
+            background_min_share=settings.TTS_BACKGROUND_MIN_SHARE,
+            reserved_interactive=settings.TTS_INTERACTIVE_RESERVED_SLOTS
+        )
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # One waiting thread per queued job; it holds a scheduler slot while its job runs
+        self._dispatcher: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stopped = threading.Event()
+
+    @property
+    def depth(self) -> int:
+        return self._pending
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn keeps workers free of the host's threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._pool
+
+    def _get_dispatcher(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._dispatcher is None:
+                self._dispatcher = ThreadPoolExecutor(max_workers=self.max_pending, thread_name_prefix="tts-jobs")
+            return self._dispatcher
+
+    def _reserve(self) -> bool:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                return False
+            self._pending += 1
+            return True
+
+    def submit(self, request: dict, priority: str = INTERACTIVE) -> str:
+        """Persist a queued job and hand it to the worker pool; returns its id"""
+        if not self._reserve():
+            metrics.inc("tts_jobs_rejected", priority=priority)
+            raise QueueFullError("TTS job queue is full")
+
+        job_id = str(uuid.uuid4())
+        db = SessionLocal()
+        try:
+            db.add(TTSJob(id=job_id, status="queued", priority=priority, request=request))
+            db.commit()
+            self._get_dispatcher().submit(self._dispatch, job_id, priority)
+        except Exception:
+            self._release()
+            raise
+        finally:
+            db.close()
+
+        metrics.inc("tts_jobs_submitted", priority=priority)
+        return job_id
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+    def _dispatch(self, job_id: str, priority: str):
+        """Wait for a slot of the job's priority, then run it on the pool"""
+        try:
+            with self.scheduler.slot(priority):
+                try:
+                    self._get_pool().submit(run_job, job_id).result()
+                except Exception as e:
+                    self._mark_failed(job_id, e)
+        finally:
+            self._release()
+
+    def _mark_failed(self, job_id: str, error: Exception):
+        # The worker died before it could record the outcome itself
+        db = SessionLocal()
+        try:
+            job = db.query(TTSJob).filter(TTSJob.id == job_id).first()
+            if job is not None and job.status in ("queued", "running"):
+                job.status = "failed"
+                job.error = f"Worker failed: {error}"
+                job.finished_at = _now()
+                db.commit()
+        finally:
+            db.close()
+
+    def recover(self) -> int:
+        """Dispatch the jobs a previous host left queued (e.g. before a restart); returns how many.
+
+        Jobs older than TTS_JOB_MAX_AGE_SECONDS, or beyond the queue's
+        capacity, are expired instead of run.
+        """
+        self.expire_stale()
+        db = SessionLocal()
+        try:
+            jobs = db.query(TTSJob.id, TTSJob.priority).filter(TTSJob.status == "queued") \
+                .order_by(TTSJob.created_at).all()
+        finally:
+            db.close()
+        recovered = 0
+        for job_id, priority in jobs:
+            if not self._reserve():
+                self._expire([job_id], "Expired: the job queue was full when the server restarted")
+                continue
+            self._get_dispatcher().submit(self._dispatch, job_id, priority)
+            recovered += 1
+        if jobs:
+            print(f"Recovered {recovered} queued TTS jobs, expired {len(jobs) - recovered}")
+        return recovered
+
+    def expire_stale(self) -> None:
+        """Fail jobs queued for longer than TTS_JOB_MAX_AGE_SECONDS or running for longer than
+        TTS_JOB_TIMEOUT_SECONDS: their host went away (or hung) before finishing them"""
+        now = _now()
+        queued_before = now - datetime.timedelta(seconds=settings.TTS_JOB_MAX_AGE_SECONDS)
+        started_before = now - datetime.timedelta(seconds=settings.TTS_JOB_TIMEOUT_SECONDS)
+        db = SessionLocal()
+        try:
+            for status, column, cutoff, error in (
+                ("queued", TTSJob.created_at, queued_before, "Expired: queued for too long"),
+                ("running", TTSJob.started_at, started_before, "Expired: the worker stopped responding"),
+            ):
+                expired = db.query(TTSJob).filter(TTSJob.status == status, column < cutoff).update(
+                    {TTSJob.status: "failed", TTSJob.error: error, TTSJob.finished_at: now},
+                    synchronize_session=False
+                )
+                if expired:
+                    metrics.inc("tts_jobs_expired", expired, status=status)
+            db.commit()
+        finally:
+            db.close()
+
+    def _expire(self, job_ids, error: str) -> None:
+        db = SessionLocal()
+        try:
+            db.query(TTSJob).filter(TTSJob.id.in_(job_ids), TTSJob.status == "queued").update(
+                {TTSJob.status: "failed", TTSJob.error: error, TTSJob.finished_at: _now()},
+                synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def start_sweeper(self, interval: float = 60.0) -> threading.Thread:
+        """Expire stale jobs every ``interval`` seconds on a daemon thread"""
+        def run():
+            while not self._stopped.wait(interval):
+                try:
+                    self.expire_stale()
+                except Exception as e:
+                    print(f"Failed to expire stale TTS jobs: {e}")
+
+        thread = threading.Thread(target=run, name="tts-jobs-sweeper", daemon=True)
+        thread.start()
+        return thread
+
+    def status(self) -> dict:
+        return {"queue_depth": self._pending, "queue_size": self.max_pending, **self.scheduler.status()}
+
+    def shutdown(self):
+        self._stopped.set()
+        if self._dispatcher is not None:
+            self._dispatcher.shutdown(wait=False, cancel_futures=True)
+            self._dispatcher = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# The queue of the job host process this module is running in, if any
+_host_queue: Optional[TTSJobQueue] = None
+
+
+def _start_host_queue():
+    global _host_queue
+    _host_queue = TTSJobQueue(
+        max_workers=settings.TTS_WORKER_PROCESSES,
+        max_pending=settings.TTS_JOB_QUEUE_SIZE,
+    )
+    atexit.register(_host_queue.shutdown)
+    try:
+        _host_queue.recover()
+    except Exception as e:
+        print(f"Failed to recover queued TTS jobs: {e}")
+    _host_queue.start_sweeper()
+
+
+def _get_host_queue() -> TTSJobQueue:
+    return _host_queue
+
+
+class JobManager(BaseManager):
+    pass
+
+
+JobManager.register("jobs", callable=_get_host_queue, exposed=("submit", "status"))
+
+
+class TTSJobHost(ProcessHost):
+    """The server's one TTSJobQueue, shared by all of its workers (see ``ProcessHost``)"""
+
+    def __init__(self):
+        super().__init__("jobs", "app.services.tts_jobs", JobManager, "jobs")
+
+    def create_job(self, db: Session, request: TTSRequest, priority: str = INTERACTIVE) -> TTSJob:
+        """Queue a job on the server's pool; raises QueueFullError once the queue is at capacity"""
+        job_id = self.proxy().submit(request.model_dump(), priority)
+        return self.get_job(db, job_id)
+
+    def get_job(self, db: Session, job_id: str) -> Optional[TTSJob]:
+        return db.query(TTSJob).filter(TTSJob.id == job_id).first()
+
+    def status(self) -> dict:
+        if not self.started:
+            return {}
+        try:
+            return self.proxy().status()
+        except (OSError, EOFError):
+            return {}
+
+
+job_host = TTSJobHost()
+
+
+if __name__ == "__main__":
+    # Run from the imported module, so errors sent back to the workers (QueueFullError) unpickle there
+    from app.services import tts_jobs
+    tts_jobs._start_host_queue()
+    serve(tts_jobs.JobManager, sys.argv[1])
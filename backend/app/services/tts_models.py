@@ -0,0 +1,561 @@
+import copy
+import gc
+import hashlib
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from typing import Callable, Dict, List, Optional, Set
+import numpy as np
+from app.services.tts_scheduler import INTERACTIVE, PriorityScheduler
+
+
+def load_coqui_model(model_name: str, quantize: bool = False, threads: int = 0):
+    """Load a Coqui model on CPU; the TTS package is imported on first use.
+
+    With ``quantize`` the linear and recurrent layers are converted to
+    dynamic int8.
+    """
+    from TTS.api import TTS
+    set_torch_threads(threads)
+    model = TTS(model_name=model_name, progress_bar=False, gpu=False)
+    # Inference only: with gradients off nothing ever writes to the weight
+    # pages, so forked workers keep sharing them copy-on-write
+    for module in _torch_modules(model):
+        module.eval()
+        for parameter in module.parameters():
+            parameter.requires_grad_(False)
+    if quantize:
+        quantize_model(model, model_name)
+    instrument_vocoder(model)
+    return model
+
+
+def set_torch_threads(threads: int) -> None:
+    """Limit intra-op threads so several workers on one box don't oversubscribe its cores"""
+    torch = sys.modules.get("torch")
+    if torch is not None and threads > 0:
+        torch.set_num_threads(threads)
+
+
+# Layer types that dynamic quantization converts to int8 weights; convolutions
+# (most of a HiFi-GAN vocoder) stay in float
+_QUANTIZABLE = ("Linear", "LSTM", "LSTMCell", "GRU", "GRUCell")
+
+
+def quantize_model(model, model_name: str) -> None:
+    """Swap the model's torch modules for dynamically int8-quantized ones in place.
+
+    Conversion only rewrites the weights of the linear and recurrent layers,
+    so it is done at every load rather than cached.
+    """
+    import torch
+    synthesizer = model.synthesizer
+    start_time = time.time()
+    layers = {getattr(torch.nn, name) for name in _QUANTIZABLE}
+    for attr in ("tts_model", "vocoder_model"):
+        module = getattr(synthesizer, attr, None)
+        if module is None or not hasattr(module, "parameters"):
+            continue
+        setattr(synthesizer, attr, torch.ao.quantization.quantize_dynamic(module, layers, dtype=torch.qint8, inplace=True))
+    print(f"Quantized {model_name} to int8 in {time.time() - start_time:.1f}s")
+
+
+_vocoder_clock = threading.local()
+
+
+def instrument_vocoder(model) -> None:
+    """Time the separate vocoder of a two-stage model (e.g. Tacotron2 + HiFi-GAN).
+
+    End-to-end models such as VITS have no vocoder and are left untouched.
+    Time spent in the vocoder accumulates per thread until read with
+    ``take_vocoder_seconds()``.
+    """
+    vocoder = getattr(getattr(model, "synthesizer", None), "vocoder_model", None)
+    if vocoder is None or getattr(vocoder, "_timed_inference", False):
+        return
+    inference = vocoder.inference
+
+    def timed_inference(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return inference(*args, **kwargs)
+        finally:
+            _vocoder_clock.seconds = getattr(_vocoder_clock, "seconds", 0.0) + time.perf_counter() - start
+
+    vocoder.inference = timed_inference
+    vocoder._timed_inference = True
+
+
+def take_vocoder_seconds() -> float:
+    """Vocoder time on this thread since the last call"""
+    seconds = getattr(_vocoder_clock, "seconds", 0.0)
+    _vocoder_clock.seconds = 0.0
+    return seconds
+
+
+def clone_model(model):
+    """A copy of a model that another thread can run at the same time.
+
+    The copy gets its own module objects, and with them its own per-call
+    state, but shares the original's weight tensors, packed int8 weights,
+    speaker manager and any arrays held directly on the model, so it costs
+    little memory.
+    """
+    memo = {}
+    torch = sys.modules.get("torch")
+    for module in _torch_modules(model):
+        for tensor in itertools.chain(module.parameters(), module.buffers()):
+            memo[id(tensor)] = tensor
+        if torch is not None:
+            for layer in module.modules():
+                for value in vars(layer).values():
+                    if isinstance(value, torch.ScriptObject):
+                        memo[id(value)] = value
+    tts_model = getattr(getattr(model, "synthesizer", None), "tts_model", None)
+    speaker_manager = getattr(tts_model, "speaker_manager", None)
+    if speaker_manager is not None:
+        # Voices registered through one instance are seen by all of them
+        memo[id(speaker_manager)] = speaker_manager
+    for value in vars(model).values():
+        if isinstance(value, np.ndarray):
+            memo[id(value)] = value
+    clone = copy.deepcopy(model, memo)
+    # The timing wrapper closes over the original vocoder; wrap the copy's own instead
+    vocoder = getattr(clone.synthesizer, "vocoder_model", None)
+    if getattr(vocoder, "_timed_inference", False):
+        del vocoder.inference, vocoder._timed_inference
+        instrument_vocoder(clone)
+    return clone
+
+
+class ModelInstances:
+    """Instances of one loaded model, each run by at most one thread at a time.
+
+    Coqui synthesizers keep per-call state on the model object (Tacotron2
+    decoder and attention states, speaker manager lookups), so two threads
+    must never run the same instance at once. Extra instances are copies that
+    share the weights (see ``clone_model``), so up to ``count`` calls into a
+    model run in parallel. Idle instances are handed out by a
+    PriorityScheduler with one slot per instance, so interactive calls get
+    the model ahead of waiting background ones.
+    """
+
+    def __init__(self, model, count: int = 1, name: str = "model", background_min_share: float = 0.2,
+                 reserved_interactive: int = 1):
+        self.models = [model]
+        for _ in range(count - 1):
+            try:
+                self.models.append(clone_model(model))
+            except Exception as e:
+                print(f"Failed to copy TTS model, running {len(self.models)} instance(s): {e}")
+                break
+        self.scheduler = PriorityScheduler(
+            name,
+            slots=len(self.models),
+            background_min_share=background_min_share,
+            reserved_interactive=reserved_interactive
+        )
+        self._free = list(self.models)
+        self._lock = threading.Lock()
+
+    def acquire(self, priority: str = INTERACTIVE):
+        """Wait for an idle instance; hand it back with ``release``"""
+        self.scheduler.acquire(priority)
+        # A granted slot always has an idle instance behind it
+        with self._lock:
+            return self._free.pop()
+
+    def release(self, instance, priority: str = INTERACTIVE) -> None:
+        with self._lock:
+            self._free.append(instance)
+        self.scheduler.release(priority)
+
+    @contextmanager
+    def use(self, priority: str = INTERACTIVE):
+        instance = self.acquire(priority)
+        try:
+            yield instance
+        finally:
+            self.release(instance, priority)
+
+
+_instances_guard = threading.Lock()
+
+
+def model_instances(model) -> ModelInstances:
+    """The instances a model runs on: set up by the registry at load, otherwise just the model itself"""
+    instances = getattr(model, "_instances", None)
+    if instances is None:
+        with _instances_guard:
+            instances = getattr(model, "_instances", None)
+            if instances is None:
+                instances = model._instances = ModelInstances(model)
+    return instances
+
+
+def inference_mode():
+    """torch.inference_mode() once torch is loaded, otherwise a no-op context"""
+    torch = sys.modules.get("torch")
+    return torch.inference_mode() if torch is not None else nullcontext()
+
+
+def _torch_modules(model) -> list:
+    synthesizer = getattr(model, "synthesizer", None)
+    modules = []
+    for attr in ("tts_model", "vocoder_model"):
+        module = getattr(synthesizer, attr, None)
+        if module is not None and hasattr(module, "parameters"):
+            modules.append(module)
+    return modules
+
+
+class ModelNotReadyError(Exception):
+    """Raised when a language's model is still loading and the caller should retry later"""
+
+    def __init__(self, language: str):
+        super().__init__(f"TTS model for {language} is not ready yet, retry shortly")
+        self.language = language
+
+
+class FakeSpeakerManager:
+    def __init__(self):
+        self.embeddings: Dict[str, dict] = {}
+        self.embeddings_by_names: Dict[str, list] = {"fake-speaker": [np.zeros(8, dtype=np.float32)]}
+
+    def compute_embedding_from_clip(self, path: str) -> list:
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).digest()
+        return [b / 255 for b in digest[:8]]
+
+
+class FakeAcousticModel:
+    def __init__(self):
+        self.speaker_manager = FakeSpeakerManager()
+
+
+class FakeSynthesizer:
+    def __init__(self, output_sample_rate: int, multi_speaker: bool = False):
+        self.output_sample_rate = output_sample_rate
+        self.tts_model = FakeAcousticModel() if multi_speaker else None
+        self.vocoder_model = None
+
+
+class FakeTTSModel:
+    """Offline stand-in for a Coqui model with the same calling surface.
+
+    Produces deterministic audio (a tone derived from the text) whose length
+    scales with the text, and takes ``real_time_factor`` seconds of wall
+    clock per second of audio so throughput behaves like real inference.
+    """
+
+    SECONDS_PER_CHAR = 0.06  # Roughly conversational speech
+
+    def __init__(self, model_name: str, real_time_factor: float = 0.1,
+                 sample_rate: int = 22050, memory_bytes: int = 0, multi_speaker: bool = False):
+        self.model_name = model_name
+        self.real_time_factor = real_time_factor
+        self.synthesizer = FakeSynthesizer(sample_rate, multi_speaker)
+        self.is_multi_speaker = multi_speaker
+        self.is_multi_lingual = multi_speaker
+        self.languages = ["en"] if multi_speaker else None
+        self.memory_bytes = memory_bytes
+        # Touch the pages so the simulated weights are really resident
+        self._weights = np.ones(memory_bytes, dtype=np.uint8) if memory_bytes else None
+
+    @property
+    def speakers(self) -> Optional[List[str]]:
+        if not self.is_multi_speaker:
+            return None
+        return list(self.synthesizer.tts_model.speaker_manager.embeddings_by_names)
+
+    def tts(self, text: str, speaker: Optional[str] = None, **kwargs) -> np.ndarray:
+        voice = ""
+        if self.is_multi_speaker:
+            if speaker not in (self.speakers or []):
+                raise ValueError(f"Model is multi-speaker but speaker {speaker!r} is unknown")
+            voice = np.asarray(self.synthesizer.tts_model.speaker_manager.embeddings_by_names[speaker][0]).tobytes().hex()
+        sample_rate = self.synthesizer.output_sample_rate
+        duration = max(len(text), 1) * self.SECONDS_PER_CHAR
+        digest = hashlib.sha256(f"{self.model_name}:{voice}:{text}".encode("utf-8")).digest()
+        frequency = 110 + int.from_bytes(digest[:2], "big") % 330
+        t = np.arange(int(duration * sample_rate), dtype=np.float32) / sample_rate
+        audio = 0.3 * np.sin(2 * np.pi * frequency * t)
+        time.sleep(duration * self.real_time_factor)
+        return audio
+
+    def tts_to_file(self, text: str, file_path: str, **kwargs) -> str:
+        from app.services.audio_utils import write_audio
+        write_audio(file_path, self.tts(text, **kwargs), self.synthesizer.output_sample_rate)
+        return file_path
+
+
+def get_model_loader(backend: str, **options) -> Callable[[str], object]:
+    """Model loader for a backend name: "coqui" for real models, "fake" for benchmarks and tests"""
+    if backend == "coqui":
+        return partial(load_coqui_model, **options)
+    if backend == "fake":
+        return partial(FakeTTSModel, **options)
+    raise ValueError(f"Unknown TTS backend: {backend}")
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _module_bytes(model) -> int:
+    """Bytes held by the parameters and buffers of a Coqui model's torch modules"""
+    if getattr(model, "memory_bytes", None):
+        return model.memory_bytes
+    total = 0
+    for module in _torch_modules(model):
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class LoadedModel:
+    def __init__(self, language: str, model_name: str, model, memory_bytes: int, load_time: float):
+        self.language = language
+        self.model_name = model_name
+        self.model = model
+        self.memory_bytes = memory_bytes
+        self.load_time = load_time
+        self.loaded_at = time.time()
+        self.last_used_at = self.loaded_at
+
+    def to_dict(self) -> dict:
+        return {
+            "language": self.language,
+            "model_name": self.model_name,
+            "memory_bytes": self.memory_bytes,
+            "load_time": self.load_time,
+            "loaded_at": self.loaded_at,
+            "last_used_at": self.last_used_at,
+        }
+
+
+class ModelRegistry:
+    """Loads one model per language on first use and keeps the resident set
+    under a memory budget by unloading the least recently used models.
+
+    Each language is in one of the states ``unloaded``, ``loading``,
+    ``warming`` (loaded in the background and running a throwaway
+    inference), ``ready``, ``retrying`` (its last load failed and a
+    background warm-up will try again) or ``failed``.
+    """
+
+    WARM_UP_TEXT = "Hello."
+
+    def __init__(self, model_map: Dict[str, str], memory_budget_bytes: int,
+                 loader: Callable[[str], object] = load_coqui_model,
+                 prepare: Optional[Callable[[str, object], dict]] = None,
+                 warm_up_attempts: int = 3, warm_up_retry_delay: float = 10.0, instances: int = 1,
+                 background_min_share: float = 0.2, reserved_interactive: int = 1):
+        self.model_map = model_map
+        self.memory_budget_bytes = memory_budget_bytes
+        self.loader = loader
+        # Called with (language, model) before warm-up; returns extra arguments for model.tts
+        self.prepare = prepare
+        # Background warm-ups try a language this many times, doubling the delay between tries
+        self.warm_up_attempts = max(warm_up_attempts, 1)
+        self.warm_up_retry_delay = warm_up_retry_delay
+        # Weight-sharing instances of each model, so that many calls into it can run at once
+        self.instances = max(instances, 1)
+        self.background_min_share = background_min_share
+        self.reserved_interactive = reserved_interactive
+        self._models: "OrderedDict[str, LoadedModel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._loading: Set[str] = set()
+        self._warming: Set[str] = set()
+        self._failed: Set[str] = set()
+        self._scheduled: Set[str] = set()  # Languages a background warm-up is working through
+        self.warmed: Set[str] = set()  # Languages that finished a warm-up at least once
+        self.given_up: Set[str] = set()  # Languages whose last background warm-up ran out of attempts
+
+    def is_available(self, language: str) -> bool:
+        return language in self.model_map
+
+    def get(self, language: str):
+        """Return the model for a language, loading it if it is not resident"""
+        with self._lock:
+            entry = self._touch(language)
+            if entry is not None:
+                return entry.model
+            load_lock = self._load_locks.setdefault(language, threading.Lock())
+
+        # Loads of different languages may overlap; the same language loads once
+        with load_lock:
+            with self._lock:
+                entry = self._touch(language)
+                if entry is not None:
+                    return entry.model
+            with self._lock:
+                self._loading.add(language)
+            try:
+                entry = self._load(language)
+            except Exception:
+                with self._lock:
+                    self._failed.add(language)
+                raise
+            finally:
+                with self._lock:
+                    self._loading.discard(language)
+            with self._lock:
+                self._failed.discard(language)
+                self._models[language] = entry
+                self._evict(keep=language)
+            return entry.model
+
+    def _touch(self, language: str) -> Optional[LoadedModel]:
+        entry = self._models.get(language)
+        if entry is not None:
+            entry.last_used_at = time.time()
+            self._models.move_to_end(language)
+        return entry
+
+    def _load(self, language: str) -> LoadedModel:
+        model_name = self.model_map[language]
+        rss_before = _rss_bytes()
+        start_time = time.time()
+        model = self.loader(model_name)
+        load_time = time.time() - start_time
+        memory_bytes = _module_bytes(model) or max(_rss_bytes() - rss_before, 0)
+        model._instances = ModelInstances(model, self.instances, f"model:{language}",
+                                          self.background_min_share, self.reserved_interactive)
+        print(f"Loaded TTS model for {language} in {load_time:.1f}s ({memory_bytes / 2**20:.0f} MiB)")
+        return LoadedModel(language, model_name, model, memory_bytes, load_time)
+
+    def _evict(self, keep: str):
+        while self.resident_bytes > self.memory_budget_bytes and len(self._models) > 1:
+            language = next(iter(self._models))
+            if language == keep:
+                self._models.move_to_end(language)
+                continue
+            evicted = self._models.pop(language)
+            print(f"Unloaded TTS model for {language} to stay under memory budget")
+            del evicted
+        gc.collect()
+
+    def preload(self, languages: List[str]) -> None:
+        """Load models up front, e.g. in a parent process before forking workers"""
+        for language in languages:
+            if not self.is_available(language):
+                continue
+            try:
+                self.get(language)
+            except Exception as e:
+                print(f"Failed to preload model for {language}: {e}")
+
+    def warm_up(self, language: str) -> bool:
+        """Load a model and run one throwaway inference so the first real request is fast"""
+        with self._lock:
+            if language in self._warming:
+                return False
+            self._warming.add(language)
+        try:
+            model = self.get(language)
+            options = self.prepare(language, model) if self.prepare else {}
+            with model_instances(model).use() as instance, inference_mode():
+                instance.tts(text=self.WARM_UP_TEXT, **options)
+            with self._lock:
+                self.warmed.add(language)
+                self.given_up.discard(language)
+            return True
+        except Exception as e:
+            print(f"Failed to warm up model for {language}: {e}")
+            return False
+        finally:
+            with self._lock:
+                self._warming.discard(language)
+
+    def warm_up_in_background(self, languages: List[str]) -> Optional[threading.Thread]:
+        """Warm models up one after another on a daemon thread, retrying failed loads.
+
+        Languages that a background warm-up already covers, or that are loading
+        or warming, are skipped, so calling this on every request for a model
+        that isn't ready starts at most one warm-up per language. Returns None
+        when there is nothing left to start.
+        """
+        with self._lock:
+            languages = [
+                language for language in dict.fromkeys(languages)
+                if self.is_available(language)
+                and language not in self._scheduled | self._loading | self._warming
+            ]
+            self._scheduled.update(languages)
+        if not languages:
+            return None
+
+        def run():
+            for language in languages:
+                try:
+                    self._warm_up_with_retries(language)
+                finally:
+                    with self._lock:
+                        self._scheduled.discard(language)
+
+        thread = threading.Thread(target=run, name="tts-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def _warm_up_with_retries(self, language: str) -> bool:
+        delay = self.warm_up_retry_delay
+        for attempt in range(1, self.warm_up_attempts + 1):
+            if self.warm_up(language):
+                return True
+            if attempt < self.warm_up_attempts:
+                time.sleep(delay)
+                delay *= 2
+        print(f"Giving up on the {language} model after {self.warm_up_attempts} attempts")
+        with self._lock:
+            self.given_up.add(language)
+        return False
+
+    def state(self, language: str) -> str:
+        with self._lock:
+            if language in self._loading:
+                return "loading"
+            if language in self._warming:
+                return "warming"
+            if language in self._models:
+                return "ready"
+            if language in self._failed:
+                return "retrying" if language in self._scheduled else "failed"
+            return "unloaded"
+
+    def is_ready(self, language: str) -> bool:
+        return self.state(language) == "ready"
+
+    def unload(self, language: str) -> bool:
+        with self._lock:
+            entry = self._models.pop(language, None)
+        if entry is None:
+            return False
+        del entry
+        gc.collect()
+        return True
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(entry.memory_bytes for entry in self._models.values())
+
+    def loaded(self) -> List[dict]:
+        """Resident models, least recently used first"""
+        with self._lock:
+            return [entry.to_dict() for entry in self._models.values()]
+
+    def queues(self) -> Dict[str, dict]:
+        """Running and waiting calls per priority on each resident model's instances"""
+        with self._lock:
+            entries = list(self._models.values())
+        return {entry.language: model_instances(entry.model).scheduler.status() for entry in entries}
@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict
+from app.core.metrics import metrics
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+PRIORITIES = (INTERACTIVE, BACKGROUND)
+
+
+class PriorityScheduler:
+    """Hands out a fixed number of synthesis slots by priority class.
+
+    Interactive work (a learner pressing play) is served before queued
+    background work (prerendering, batches, regeneration). To keep bulk
+    work from starving, a waiting background request is let through
+    whenever background work has had less than ``background_min_share`` of
+    the last ``window`` grants. ``reserved_interactive`` slots are never
+    given to background work, so there is always room for interactive
+    requests even while a backfill is running. Within a class, requests are
+    served in arrival order.
+    """
+
+    def __init__(self, name: str, slots: int, background_min_share: float = 0.2,
+                 reserved_interactive: int = 1, window: int = 20):
+        self.name = name
+        self.slots = max(slots, 1)
+        self.background_min_share = background_min_share
+        # Background work always gets at least one slot, or it could never run on a single-slot pool
+        self.background_slots = max(self.slots - reserved_interactive, 1)
+        self._cond = threading.Condition()
+        self._waiting: Dict[str, Deque[object]] = {priority: deque() for priority in PRIORITIES}
+        self._running: Dict[str, int] = {priority: 0 for priority in PRIORITIES}
+        self._recent: Deque[str] = deque(maxlen=window)
+
+    def _background_share(self) -> float:
+        if not self._recent:
+            return 0.0
+        return sum(1 for priority in self._recent if priority == BACKGROUND) / len(self._recent)
+
+    def _next(self):
+        """The ticket to grant next, or None while no slot can be granted"""
+        if sum(self._running.values()) >= self.slots:
+            return None
+        interactive, background = self._waiting[INTERACTIVE], self._waiting[BACKGROUND]
+        background_allowed = bool(background) and self._running[BACKGROUND] < self.background_slots
+        if background_allowed and (not interactive or self._background_share() < self.background_min_share):
+            return background[0]
+        if interactive:
+            return interactive[0]
+        return None
+
+    def acquire(self, priority: str) -> float:
+        """Block until a slot is granted; returns the seconds spent waiting"""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        ticket = object()
+        start_time = time.perf_counter()
+        with self._cond:
+            self._waiting[priority].append(ticket)
+            while self._next() is not ticket:
+                self._cond.wait()
+            self._waiting[priority].popleft()
+            self._running[priority] += 1
+            self._recent.append(priority)
+            # More than one slot may be free
+            self._cond.notify_all()
+        waited = time.perf_counter() - start_time
+        metrics.observe("tts_queue_wait_seconds", waited, queue=self.name, priority=priority)
+        return waited
+
+    def release(self, priority: str) -> None:
+        with self._cond:
+            self._running[priority] -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: str):
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def status(self) -> dict:
+        with self._cond:
+            return {
+                "slots": self.slots,
+                "background_slots": self.background_slots,
+                "running": dict(self._running),
+                "waiting": {priority: len(waiters) for priority, waiters in self._waiting.items()},
+                "background_share": self._background_share(),
+            }
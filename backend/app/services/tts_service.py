@@ -1,107 +1,641 @@
 import uuid
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.models.audio import AudioFile
 from app.schemas.tts import TTSRequest, TTSResponse
+from app.core.cache import get_cached_audio_key
 from app.core.config import settings
-from typing import Optional
-from TTS.api import TTS
+from app.core.database import SessionLocal
+from app.core.metrics import StageTimer, metrics
+from app.core.singleflight import SingleFlight
+from app.services.audio_storage import audio_storage
+from app.services.audio_utils import (
+    concatenate, normalize_loudness, resample, silence_pcm16, to_pcm16, trim_silence,
+    wav_stream_header, write_audio, write_wav
+)
+from app.services.phrase_cache import PhraseCache
+from app.services.tts_scheduler import BACKGROUND, INTERACTIVE
+from app.services.tts_models import (
+    ModelNotReadyError, ModelRegistry, get_model_loader, inference_mode, model_instances, take_vocoder_seconds
+)
+from app.services.tts_text import split_sentences
+from app.services.tts_voices import VoiceBank
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Real-time factor histogram bounds: seconds of compute per second of audio
+RTF_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0, 10.0)
 
 class TTSService:
-    def __init__(self):
-        self.models = {}
-        self._load_models()
+    def __init__(self, wait_for_models: bool = True, torch_threads: Optional[int] = None):
+        # Models load lazily on first use and are unloaded under memory pressure.
+        # Without wait_for_models, a miss on a model that isn't ready starts
+        # warming it in the background and raises ModelNotReadyError instead.
+        # torch_threads overrides TTS_TORCH_THREADS (e.g. one per core of a pinned shard)
+        self.wait_for_models = wait_for_models
+        self.phrase_cache = PhraseCache(
+            settings.TTS_PHRASE_CACHE_DIR or os.path.join(settings.AUDIO_OUTPUT_DIR, "phrases"),
+            max_bytes=settings.TTS_PHRASE_CACHE_MAX_BYTES
+        ) if settings.TTS_PHRASE_CACHE_ENABLED else None
+        self.registry = ModelRegistry(
+            settings.TTS_MODEL_MAP,
+            memory_budget_bytes=settings.TTS_MODEL_MEMORY_BUDGET_BYTES,
+            loader=get_model_loader(settings.TTS_BACKEND, **self.backend_options(torch_threads)),
+            prepare=self._prepare_model,
+            warm_up_attempts=settings.TTS_WARMUP_ATTEMPTS,
+            warm_up_retry_delay=settings.TTS_WARMUP_RETRY_DELAY,
+            instances=self._sentence_workers(),
+            # Interactive calls get a model first; background calls keep a guaranteed minimum share
+            background_min_share=settings.TTS_BACKGROUND_MIN_SHARE,
+            reserved_interactive=settings.TTS_INTERACTIVE_RESERVED_SLOTS
+        )
+        self._sentence_pool: Optional[ThreadPoolExecutor] = None
+        self.voices = VoiceBank(settings.TTS_VOICES, os.path.join(settings.TTS_MODELS_DIR, "voices"))
+        # Identical requests arriving together share one synthesis
+        self.inflight = SingleFlight(settings.TTS_LOCK_DIR or os.path.join(settings.AUDIO_OUTPUT_DIR, "locks"))
     
-    def _load_models(self):
-        """Pre-load TTS models for better performance"""
-        for language, model_name in settings.TTS_MODEL_MAP.items():
-            try:
-                self.models[language] = TTS(
-                    model_name=model_name, 
-                    progress_bar=False, 
-                    gpu=False
-                )
-            except Exception as e:
-                print(f"Failed to load model for {language}: {e}")
+    def _get_model(self, language: str):
+        if not self.registry.is_available(language):
+            raise ValueError(f"TTS model not available for {language}")
+        if not self.wait_for_models and not self.registry.is_ready(language):
+            # No-op while a warm-up for this language is already under way
+            self.registry.warm_up_in_background([language])
+            raise ModelNotReadyError(language)
+        try:
+            return self.registry.get(language)
+        except Exception as e:
+            print(f"Failed to load model for {language}: {e}")
+            raise ValueError(f"TTS model not available for {language}")
     
-    def synthesize(self, request: TTSRequest, db: Session) -> TTSResponse:
-        """Generate speech from text and save to database"""
+    @staticmethod
+    def backend_options(torch_threads: Optional[int] = None) -> dict:
+        options = dict(settings.TTS_BACKEND_OPTIONS)
+        if settings.TTS_BACKEND == "coqui":
+            options.setdefault("threads", settings.TTS_TORCH_THREADS if torch_threads is None else torch_threads)
+            if settings.TTS_QUANTIZE:
+                options.setdefault("quantize", True)
+        return options
+
+    @staticmethod
+    def preload_languages() -> List[str]:
+        """Languages loaded and warmed at startup"""
+        return settings.TTS_PRELOAD_LANGUAGES or list(settings.TTS_MODEL_MAP)
+
+    @staticmethod
+    def model_version(language: str) -> str:
+        """Model name plus configured revision, recorded on every rendered file"""
+        revision = settings.TTS_MODEL_REVISIONS.get(language, "1")
+        # Quantized models sound slightly different, so their audio is cached separately
+        variant = "+int8" if settings.TTS_QUANTIZE and settings.TTS_BACKEND == "coqui" else ""
+        return f"{settings.TTS_MODEL_MAP.get(language, '')}@{revision}{variant}"
+
+    @staticmethod
+    def voice_for(request: TTSRequest) -> Optional[str]:
+        """Configured voice a request renders with, or None for languages without named voices"""
+        language = request.language.lower()
+        voices = settings.TTS_VOICES.get(language, {})
+        if request.voice:
+            if request.voice not in voices:
+                raise ValueError(f"Unknown voice for {language}: {request.voice}")
+            return request.voice
+        return settings.TTS_DEFAULT_VOICES.get(language) or next(iter(voices), None)
+
+    @staticmethod
+    def _voice_params(request: TTSRequest) -> dict:
+        # Only languages with named voices carry one, so other keys stay unchanged
+        voice = TTSService.voice_for(request)
+        return {"voice": voice} if voice else {}
+
+    @staticmethod
+    def cache_key(request: TTSRequest) -> str:
+        """Content-addressed key for the audio this request would produce"""
+        language = request.language.lower()
+        return get_cached_audio_key(
+            request.text,
+            language,
+            TTSService.model_version(language),
+            voice_speed=request.voice_speed,
+            voice_pitch=request.voice_pitch,
+            output_format=request.output_format,
+            sample_rate=request.sample_rate,
+            **TTSService._voice_params(request)
+        )
+
+    @staticmethod
+    def stream_request(request: TTSRequest) -> TTSRequest:
+        """The request a stream renders and caches: always WAV, only the sample rate is honoured"""
+        return request.model_copy(update={"output_format": "wav", "keep_original": False})
+
+    @staticmethod
+    def audio_url(filename: str) -> str:
+        return f"/api/audio/{filename}"
+
+    def _original_request(self, request: TTSRequest) -> TTSRequest:
+        """The uncompressed, native-rate variant of a request"""
+        return request.model_copy(update={"output_format": "wav", "sample_rate": None, "keep_original": False})
+
+    def lookup(self, request: TTSRequest, db: Session) -> Optional[TTSResponse]:
+        """Validate a request and return its cached audio, or None on a miss"""
         language = request.language.lower()
         
         if language not in settings.SUPPORTED_LANGUAGES:
             raise ValueError(f"Unsupported language: {language}")
         
-        if language not in self.models:
-            raise ValueError(f"TTS model not available for {language}")
+        cached = self._get_cached(db, self.cache_key(request))
+        if cached is not None:
+            metrics.inc("tts_cache_hits", language=language)
+            return self._to_response(cached, cached=True)
+        metrics.inc("tts_cache_misses", language=language)
+        return None
+
+    def synthesize(self, request: TTSRequest, db: Session, priority: str = INTERACTIVE) -> TTSResponse:
+        """Generate speech from text and save to database, reusing cached audio"""
+        cached = self.lookup(request, db)
+        if cached is not None:
+            return cached
+
+        language = request.language.lower()
+        cache_key = self.cache_key(request)
+        response, coalesced = self.inflight.do(
+            cache_key, lambda: self._synthesize_once(request, language, cache_key, db, priority)
+        )
+        if coalesced:
+            metrics.inc("tts_coalesced", language=language, scope="process")
+        return response
+
+    def _synthesize_once(self, request: TTSRequest, language: str, cache_key: str, db: Session,
+                         priority: str) -> TTSResponse:
+        """Render and store a cache miss while holding the cross-worker lock for its key"""
+        self._release_connection(db)
+        with self.inflight.lock(cache_key):
+            # Another worker may have rendered it while we waited for the lock
+            cached = self._get_cached(db, cache_key)
+            if cached is not None:
+                metrics.inc("tts_coalesced", language=language, scope="worker")
+                return self._to_response(cached, cached=True)
+            self._release_connection(db)
         
-        # Generate unique filename
-        filename = f"{uuid.uuid4()}.wav"
-        output_path = os.path.join(settings.AUDIO_OUTPUT_DIR, filename)
+            model = self._get_model(language)
+            timer = StageTimer()
+            output_path, duration, original_path = self._render(model, cache_key, request, timer, priority)
+            self._observe(language, duration, timer)
+            if original_path:
+                original_key = self.cache_key(self._original_request(request))
+                try:
+                    self._record(db, request, language, original_key, original_path, duration, timer.total)
+                except Exception as e:
+                    print(f"Failed to store original audio for {cache_key}: {e}")
+            return self._record(db, request, language, cache_key, output_path, duration, timer.total)
+
+    @staticmethod
+    def _release_connection(db: Session) -> None:
+        """End the session's read transaction so its pooled connection is free while we wait or render.
+
+        A render takes seconds; the session checks a connection out again to record the result.
+        """
+        db.commit()
+
+    def synthesize_batch(self, requests: List[TTSRequest], db: Session,
+                         priority: str = BACKGROUND) -> List[Tuple[Optional[TTSResponse], Optional[str]]]:
+        """Synthesize many texts, returning (result, error) pairs in input order.
+
+        Cached items are resolved with a single query, misses are rendered
+        language by language on the same model, and all new rows are written
+        in one transaction.
+        """
+        results: List[Tuple[Optional[TTSResponse], Optional[str]]] = [(None, None)] * len(requests)
+        keys: Dict[int, str] = {}
+        for index, request in enumerate(requests):
+            if request.language.lower() not in settings.SUPPORTED_LANGUAGES:
+                results[index] = (None, f"Unsupported language: {request.language.lower()}")
+                continue
+            try:
+                keys[index] = self.cache_key(request)
+            except ValueError as e:
+                results[index] = (None, str(e))
+
+        # Resolve cache hits in one round trip
+        cached: Dict[str, AudioFile] = {}
+        if keys:
+            rows = db.query(AudioFile).filter(AudioFile.cache_key.in_(set(keys.values()))).all()
+            cached = {row.cache_key: row for row in rows if os.path.exists(row.file_path)}
+            if cached:
+                db.query(AudioFile).filter(AudioFile.cache_key.in_(list(cached))).update(
+                    {AudioFile.last_accessed_at: func.now(), AudioFile.hit_count: AudioFile.hit_count + 1},
+                    synchronize_session=False
+                )
+                db.commit()
+
+        # Group distinct misses by language so each model runs back-to-back
+        misses: Dict[str, Dict[str, int]] = {}
+        for index, cache_key in keys.items():
+            language = requests[index].language.lower()
+            if cache_key in cached:
+                metrics.inc("tts_cache_hits", language=language)
+                results[index] = (self._to_response(cached[cache_key], cached=True), None)
+            else:
+                misses.setdefault(language, {}).setdefault(cache_key, index)
+        if misses:
+            self._release_connection(db)
+
+        rendered: Dict[str, Tuple[int, str, float, float]] = {}
+        errors: Dict[str, str] = {}
+        for language, items in misses.items():
+            metrics.inc("tts_cache_misses", len(items), language=language)
+            try:
+                model = self._get_model(language)
+            except (ValueError, ModelNotReadyError) as e:
+                errors.update({cache_key: str(e) for cache_key in items})
+                continue
+            for cache_key, index in items.items():
+                try:
+                    timer = StageTimer()
+                    # Each call into the model waits by priority, so interactive requests cut in between sentences
+                    output_path, duration, original_path = self._render(
+                        model, cache_key, requests[index], timer, priority
+                    )
+                    self._observe(language, duration, timer)
+                    rendered[cache_key] = (index, output_path, duration, timer.total)
+                    if original_path:
+                        original_key = self.cache_key(self._original_request(requests[index]))
+                        rendered.setdefault(original_key, (index, original_path, duration, timer.total))
+                except Exception as e:
+                    errors[cache_key] = str(e)
+
+        stored = self._record_many(db, requests, rendered)
+        for index, cache_key in keys.items():
+            if cache_key in cached:
+                continue
+            if cache_key in stored:
+                results[index] = (stored[cache_key], None)
+            else:
+                results[index] = (None, errors.get(cache_key, "TTS generation failed"))
+        return results
+
+    def _render(self, model, cache_key: str, request: TTSRequest, timer: StageTimer,
+                priority: str = INTERACTIVE) -> Tuple[str, float, Optional[str]]:
+        """Render a request to its content-addressed file.
+
+        Returns the output path, the audio duration in seconds and, when the
+        request asks to keep it, the path of the uncompressed native-rate
+        original. Time spent in each stage is added to ``timer``.
+        Files are written under a temporary name first so concurrent
+        renderings of the same text never expose a partial file.
+        """
+        output_path = os.path.join(settings.AUDIO_OUTPUT_DIR, f"{cache_key}.{request.output_format}")
+        original_path = None
+        if request.keep_original and (request.output_format != "wav" or request.sample_rate):
+            original_key = self.cache_key(self._original_request(request))
+            original_path = os.path.join(settings.AUDIO_OUTPUT_DIR, f"{original_key}.wav")
+        tmp_paths = []
         
         # Ensure output directory exists
         os.makedirs(settings.AUDIO_OUTPUT_DIR, exist_ok=True)
         
         try:
             # Generate audio
-            start_time = time.time()
-            self.models[language].tts_to_file(
-                text=request.text, 
-                file_path=output_path
-            )
-            generation_time = time.time() - start_time
-            
-            # Get file info
-            file_size = os.path.getsize(output_path) if os.path.exists(output_path) else 0
-            
-            # Save to database
-            audio_file = AudioFile(
-                filename=filename,
-                original_text=request.text,
-                language=language,
-                file_path=output_path,
-                file_size=file_size,
-                duration=int(generation_time)
-            )
-            db.add(audio_file)
-            db.commit()
-            db.refresh(audio_file)
-            
-            return TTSResponse(
-                audio_url=f"/static/audio/{filename}",
-                filename=filename,
-                duration=generation_time,
-                file_size=file_size
-            )
+            samples = self._synthesize_text(model, request, timer, priority)
+            sample_rate = model.synthesizer.output_sample_rate
+            duration = len(samples) / sample_rate
+
+            with timer.stage("write"):
+                if original_path:
+                    tmp_paths.append(f"{original_path}.{uuid.uuid4().hex}.tmp")
+                    write_audio(tmp_paths[-1], samples, sample_rate, "wav")
+                    os.replace(tmp_paths[-1], original_path)
+
+                tmp_paths.append(f"{output_path}.{uuid.uuid4().hex}.tmp")
+                target_rate = request.sample_rate or sample_rate
+                write_audio(
+                    tmp_paths[-1],
+                    resample(samples, sample_rate, target_rate),
+                    target_rate,
+                    request.output_format
+                )
+                os.replace(tmp_paths[-1], output_path)
+            return output_path, duration, original_path
             
         except Exception as e:
             # Clean up file if it was created
-            if os.path.exists(output_path):
-                os.remove(output_path)
+            for tmp_path in tmp_paths:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
             raise Exception(f"TTS generation failed: {str(e)}")
-    
+
+    def _synthesize_text(self, model, request: TTSRequest, timer: StageTimer, priority: str = INTERACTIVE):
+        """Synthesize text sentence by sentence through the phrase cache.
+
+        Long texts can be sharded: their sentences are looked up, rendered and
+        levelled on a thread pool, each on its own instance of the model (see
+        ``ModelInstances``), and stitched back in order. Every call into the
+        model waits for an instance by ``priority``.
+        """
+        with timer.stage("preprocess"):
+            sentences = split_sentences(request.text) or [request.text]
+        if self._parallel(request.text, sentences):
+            pieces = self._synthesize_parallel(model, request, sentences, timer, priority)
+        elif self.phrase_cache is None:
+            return self._infer(model, request, request.text, timer, priority)
+        else:
+            pieces = [self._synthesize_sentence(model, request, sentence, timer, priority) for sentence in sentences]
+        with timer.stage("postprocess"):
+            return concatenate(pieces, model.synthesizer.output_sample_rate, settings.TTS_SENTENCE_PAUSE_MS)
+
+    def _parallel(self, text: str, sentences: List[str]) -> bool:
+        """Whether a text is long enough for parallel synthesis to beat its overhead"""
+        return (
+            self._sentence_workers() > 1
+            and len(sentences) >= settings.TTS_PARALLEL_MIN_SENTENCES
+            and len(text) >= settings.TTS_PARALLEL_MIN_CHARS
+        )
+
+    @staticmethod
+    def _sentence_workers() -> int:
+        return settings.TTS_PARALLEL_WORKERS or os.cpu_count() or 1
+
+    def _synthesize_parallel(self, model, request: TTSRequest, sentences: List[str], timer: StageTimer,
+                             priority: str) -> list:
+        if self._sentence_pool is None:
+            # Shared by all requests, so concurrent long texts never use more than one thread per core
+            self._sentence_pool = ThreadPoolExecutor(
+                max_workers=self._sentence_workers(), thread_name_prefix="tts-sentence"
+            )
+        timers = [StageTimer() for _ in sentences]
+        start_time = time.perf_counter()
+        futures = [
+            self._sentence_pool.submit(self._synthesize_sentence, model, request, sentence, sentence_timer, priority)
+            for sentence, sentence_timer in zip(sentences, timers)
+        ]
+        pieces = [future.result() for future in futures]
+        timer.merge(timers, time.perf_counter() - start_time)
+        metrics.inc("tts_parallel_syntheses", language=request.language.lower())
+        return pieces
+
+    def _synthesize_sentence(self, model, request: TTSRequest, sentence: str, timer: StageTimer,
+                             priority: str = INTERACTIVE):
+        samples = self._synthesize_sentence_raw(model, request, sentence, timer, priority)
+        if settings.TTS_SENTENCE_TARGET_DBFS is None:
+            return samples
+        # Level every sentence the same way so stitched chunks match in loudness and gap length
+        with timer.stage("postprocess"):
+            samples = trim_silence(samples, model.synthesizer.output_sample_rate)
+            return normalize_loudness(samples, settings.TTS_SENTENCE_TARGET_DBFS)
+
+    def _synthesize_sentence_raw(self, model, request: TTSRequest, sentence: str, timer: StageTimer,
+                                 priority: str):
+        if self.phrase_cache is None:
+            return self._infer(model, request, sentence, timer, priority)
+        language = request.language.lower()
+        with timer.stage("preprocess"):
+            key = get_cached_audio_key(
+                sentence,
+                language,
+                self.model_version(language),
+                kind="phrase",
+                voice_speed=request.voice_speed,
+                voice_pitch=request.voice_pitch,
+                **self._voice_params(request)
+            )
+        with timer.stage("phrase_cache"):
+            samples = self.phrase_cache.get(key)
+        if samples is None:
+            samples = self._infer(model, request, sentence, timer, priority)
+            with timer.stage("phrase_cache"):
+                self.phrase_cache.put(key, samples, model.synthesizer.output_sample_rate)
+        return samples
+
+    def _infer(self, model, request: TTSRequest, text: str, timer: StageTimer, priority: str = INTERACTIVE):
+        """Run an idle instance of the model, splitting its time into acoustic model and vocoder"""
+        instances = model_instances(model)
+        with timer.stage("model_wait"):
+            instance = instances.acquire(priority)
+        try:
+            with timer.stage("preprocess"):
+                options = self._model_options(instance, request.language.lower(), self.voice_for(request))
+            take_vocoder_seconds()
+            start_time = time.perf_counter()
+            with inference_mode():
+                samples = instance.tts(text=text, **options)
+            elapsed = time.perf_counter() - start_time
+        finally:
+            instances.release(instance, priority)
+        vocoder_seconds = take_vocoder_seconds()
+        timer.add("inference", elapsed - vocoder_seconds)
+        if vocoder_seconds:
+            timer.add("vocoder", vocoder_seconds)
+        return samples
+
+    def _model_options(self, model, language: str, voice: Optional[str]) -> dict:
+        """Speaker and language arguments for multi-speaker, multilingual models like your_tts"""
+        if not getattr(model, "is_multi_speaker", False):
+            return {}
+        options = {"speaker": self.voices.speaker(model, settings.TTS_MODEL_MAP[language], language, voice)}
+        if getattr(model, "is_multi_lingual", False):
+            options["language"] = settings.TTS_MODEL_LANGUAGES.get(language) or model.languages[0]
+        return options
+
+    def _prepare_model(self, language: str, model) -> dict:
+        """Precompute a freshly loaded model's voice embeddings; returns warm-up arguments"""
+        if not getattr(model, "is_multi_speaker", False):
+            return {}
+        self.voices.prepare(model, settings.TTS_MODEL_MAP[language], language)
+        request = TTSRequest(text=ModelRegistry.WARM_UP_TEXT, language=language)
+        return self._model_options(model, language, self.voice_for(request))
+
+    def _observe(self, language: str, duration: float, timer: StageTimer) -> None:
+        """Record stage timings, audio length and real-time factor of one synthesis"""
+        for stage, seconds in timer.stages.items():
+            metrics.observe("tts_stage_seconds", seconds, language=language, stage=stage)
+        metrics.observe("tts_synthesis_seconds", timer.total, language=language)
+        metrics.observe("tts_audio_seconds", duration, language=language)
+        if duration:
+            metrics.observe("tts_real_time_factor", timer.total / duration, buckets=RTF_BUCKETS, language=language)
+
+    def stream(self, request: TTSRequest, db: Session) -> Iterator[bytes]:
+        """Synthesize sentence by sentence, yielding WAV bytes as each one finishes.
+
+        Validation and the cache lookup happen before the first chunk so
+        errors surface as a normal response. Once the stream completes the
+        assembled audio is stored in the cache like any other synthesis.
+        """
+        request = self.stream_request(request)
+        language = request.language.lower()
+
+        if language not in settings.SUPPORTED_LANGUAGES:
+            raise ValueError(f"Unsupported language: {language}")
+
+        cache_key = self.cache_key(request)
+        cached = self._get_cached(db, cache_key)
+        if cached is not None:
+            metrics.inc("tts_cache_hits", language=language)
+            return self._stream_file(cached.file_path)
+        metrics.inc("tts_cache_misses", language=language)
+
+        model = self._get_model(language)
+        sentences = split_sentences(request.text)
+        if not sentences:
+            raise ValueError("Text is empty")
+        return self._stream_sentences(request, language, cache_key, model, sentences)
+
+    def _stream_sentences(self, request: TTSRequest, language: str, cache_key: str,
+                          model, sentences: List[str]) -> Iterator[bytes]:
+        model_rate = model.synthesizer.output_sample_rate
+        sample_rate = request.sample_rate or model_rate
+        pause = silence_pcm16(sample_rate, settings.TTS_SENTENCE_PAUSE_MS)
+        chunks = []
+        timer = StageTimer()
+
+        yield wav_stream_header(sample_rate)
+        for index, sentence in enumerate(sentences):
+            samples = self._synthesize_sentence(model, request, sentence, timer)
+            with timer.stage("write"):
+                pcm = to_pcm16(resample(samples, model_rate, sample_rate))
+            if index < len(sentences) - 1:
+                pcm += pause
+            chunks.append(pcm)
+            yield pcm
+
+        # The request's session is gone once streaming starts, so persist with our own
+        filename = f"{cache_key}.wav"
+        output_path = os.path.join(settings.AUDIO_OUTPUT_DIR, filename)
+        tmp_path = f"{output_path}.{uuid.uuid4().hex}.tmp"
+        os.makedirs(settings.AUDIO_OUTPUT_DIR, exist_ok=True)
+        pcm = b"".join(chunks)
+        duration = len(pcm) / 2 / sample_rate
+        db = SessionLocal()
+        try:
+            with timer.stage("write"):
+                write_wav(tmp_path, pcm, sample_rate)
+                os.replace(tmp_path, output_path)
+            self._observe(language, duration, timer)
+            self._record(db, request, language, cache_key, output_path, duration, timer.total)
+        except Exception as e:
+            print(f"Failed to store streamed audio {filename}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        finally:
+            db.close()
+
+    def _stream_file(self, path: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        with open(path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    def _record(self, db: Session, request: TTSRequest, language: str, cache_key: str,
+                output_path: str, duration: float, generation_time: float) -> TTSResponse:
+        """Save a freshly rendered file in the cache and return its response"""
+        audio_file = self._new_audio_file(request, language, cache_key, output_path, duration, generation_time)
+        db.add(audio_file)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another request rendered the same text first; its row owns the file
+            db.rollback()
+            existing = db.query(AudioFile).filter(AudioFile.cache_key == cache_key).first()
+            if existing is None:
+                raise
+            return self._to_response(existing)
+        db.refresh(audio_file)
+
+        audio_storage.enforce_budget(db, keep_ids=[audio_file.id])
+
+        return self._to_response(audio_file)
+
+    def _record_many(self, db: Session, requests: List[TTSRequest],
+                     rendered: Dict[str, Tuple[int, str, float, float]]) -> Dict[str, TTSResponse]:
+        """Save a batch of rendered files in one transaction, keyed by cache key"""
+        if not rendered:
+            return {}
+
+        audio_files = {
+            cache_key: self._new_audio_file(
+                requests[index], requests[index].language.lower(), cache_key, output_path, duration, generation_time
+            )
+            for cache_key, (index, output_path, duration, generation_time) in rendered.items()
+        }
+        db.add_all(audio_files.values())
+        try:
+            db.commit()
+        except IntegrityError:
+            # Some keys were stored concurrently; keep their rows and insert the rest
+            db.rollback()
+            existing = {
+                row.cache_key for row in
+                db.query(AudioFile.cache_key).filter(AudioFile.cache_key.in_(list(audio_files)))
+            }
+            audio_files = {
+                cache_key: self._new_audio_file(
+                    requests[index], requests[index].language.lower(), cache_key, output_path, duration, generation_time
+                )
+                for cache_key, (index, output_path, duration, generation_time) in rendered.items()
+                if cache_key not in existing
+            }
+            db.add_all(audio_files.values())
+            db.commit()
+            for row in db.query(AudioFile).filter(AudioFile.cache_key.in_(list(existing))):
+                audio_files[row.cache_key] = row
+
+        audio_storage.enforce_budget(db, keep_ids=[row.id for row in audio_files.values()])
+
+        return {cache_key: self._to_response(audio_file) for cache_key, audio_file in audio_files.items()}
+
+    def _new_audio_file(self, request: TTSRequest, language: str, cache_key: str,
+                        output_path: str, duration: float, generation_time: float) -> AudioFile:
+        return AudioFile(
+            filename=os.path.basename(output_path),
+            original_text=request.text,
+            language=language,
+            file_path=output_path,
+            file_size=os.path.getsize(output_path) if os.path.exists(output_path) else 0,
+            duration=duration,
+            generation_time=generation_time,
+            cache_key=cache_key,
+            model_name=settings.TTS_MODEL_MAP.get(language),
+            model_version=self.model_version(language)
+        )
+
+    def _get_cached(self, db: Session, cache_key: str) -> Optional[AudioFile]:
+        """Return the cached row for a key, dropping it if its file has gone missing"""
+        audio_file = db.query(AudioFile).filter(AudioFile.cache_key == cache_key).first()
+        if audio_file is None:
+            return None
+        if not os.path.exists(audio_file.file_path):
+            db.delete(audio_file)
+            db.commit()
+            return None
+        audio_file.last_accessed_at = func.now()
+        audio_file.hit_count = AudioFile.hit_count + 1
+        db.commit()
+        db.refresh(audio_file)
+        return audio_file
+
+    def _to_response(self, audio_file: AudioFile, cached: bool = False) -> TTSResponse:
+        return TTSResponse(
+            audio_url=self.audio_url(audio_file.filename),
+            filename=audio_file.filename,
+            duration=audio_file.duration,
+            file_size=audio_file.file_size,
+            generation_time=audio_file.generation_time,
+            cached=cached
+        )
+
     def get_audio_file(self, db: Session, filename: str) -> Optional[AudioFile]:
         """Get audio file record from database"""
         return db.query(AudioFile).filter(AudioFile.filename == filename).first()
     
-    def cleanup_old_files(self, db: Session, max_age_hours: int = 24) -> int:
-        """Clean up old audio files to save space"""
-        import datetime
-        cutoff_time = datetime.datetime.now() - datetime.timedelta(hours=max_age_hours)
-        
-        old_files = db.query(AudioFile).filter(
-            AudioFile.created_at < cutoff_time
-        ).all()
-        
-        deleted_count = 0
-        for audio_file in old_files:
-            try:
-                if os.path.exists(audio_file.file_path):
-                    os.remove(audio_file.file_path)
-                db.delete(audio_file)
-                deleted_count += 1
-            except Exception as e:
-                print(f"Failed to delete {audio_file.filename}: {e}")
-        
-        db.commit()
-        return deleted_count
+    def cleanup(self, db: Session, max_idle_hours: Optional[int] = None, reconcile: bool = True) -> dict:
+        """Bring audio storage under budget, optionally expiring idle files and fixing orphans"""
+        expired = audio_storage.expire_idle(db, max_idle_hours) if max_idle_hours else 0
+        evicted = audio_storage.enforce_budget(db)
+        orphan_files, orphan_rows = audio_storage.reconcile(db) if reconcile else (0, 0)
+        return {
+            "expired": expired,
+            "evicted": evicted,
+            "orphan_files_removed": orphan_files,
+            "orphan_rows_removed": orphan_rows,
+            "usage_bytes": audio_storage.usage(db),
+            "budget_bytes": audio_storage.budget_bytes
+        }
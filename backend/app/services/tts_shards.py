@@ -0,0 +1,303 @@
+import atexit
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.managers import BaseManager
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.schemas.tts import TTSRequest
+from app.services.tts_host import ProcessHost, serve
+from app.services.tts_jobs import QueueFullError
+
+# The service of the shard process this module is running in, if any
+_shard_service = None
+
+
+def _init_shard(language: str, cpus: List[int], threads: int):
+    """Pin the shard process to its cores, then load and warm its one model"""
+    global _shard_service
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    from app.services.tts_service import TTSService
+    _shard_service = TTSService(torch_threads=threads)
+    # Failing here breaks the pool, so the shard reports failed instead of taking requests it can't serve
+    if not _shard_service.registry.warm_up(language):
+        raise RuntimeError(f"TTS model for {language} failed to load")
+
+
+def _shard_ready() -> int:
+    return os.getpid()
+
+
+def _shard_synthesize(request: dict) -> dict:
+    db = SessionLocal()
+    try:
+        return _shard_service.synthesize(request=TTSRequest(**request), db=db).model_dump()
+    finally:
+        db.close()
+
+
+class Shard:
+    """One synthesis process serving a single language, with a bounded queue.
+
+    A shard whose model fails to load is restarted up to TTS_WARMUP_ATTEMPTS
+    times in all, TTS_WARMUP_RETRY_DELAY seconds apart (doubling), like an
+    in-process warm-up; after that it is ``given_up`` until a later start
+    (e.g. on demand, by a request) succeeds.
+    """
+
+    def __init__(self, language: str, replica: int, cpus: List[int], max_pending: int):
+        self.language = language
+        self.replica = replica
+        self.cpus = cpus
+        # One intra-op thread per pinned core
+        self.threads = len(cpus) if cpus and hasattr(os, "sched_setaffinity") else settings.TTS_TORCH_THREADS
+        self.max_pending = max_pending
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._started: Optional[Future] = None
+        self._retry: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.attempts = 0  # Failed starts since the last successful one
+        self.given_up = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.language}-{self.replica}"
+
+    @property
+    def depth(self) -> int:
+        return self._pending
+
+    def start(self):
+        """Spawn the process; the model loads in its initializer"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_shard,
+                    initargs=(self.language, self.cpus, self.threads),
+                )
+                self._started = self._pool.submit(_shard_ready)
+                self._started.add_done_callback(self._on_started)
+
+    def _on_started(self, started: Future):
+        if started.cancelled():
+            return
+        error = started.exception()
+        if error is None:
+            self.attempts, self.given_up = 0, False
+            return
+        self.attempts += 1
+        if self.attempts >= settings.TTS_WARMUP_ATTEMPTS:
+            print(f"Giving up on TTS shard {self.name} after {self.attempts} attempts: {error}")
+            self.given_up = True
+            return
+        delay = settings.TTS_WARMUP_RETRY_DELAY * 2 ** (self.attempts - 1)
+        print(f"TTS shard {self.name} failed to start ({error}), retrying in {delay:g}s")
+        self._retry = threading.Timer(delay, self._restart)
+        self._retry.daemon = True
+        self._retry.start()
+
+    def _restart(self):
+        self._retry = None
+        self.shutdown()
+        self.start()
+
+    def state(self) -> str:
+        started = self._started
+        if started is None:
+            return "unloaded"
+        if not started.done():
+            return "warming"
+        if started.exception() is None:
+            return "ready"
+        return "retrying" if self._retry is not None else "failed"
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                return False
+            self._pending += 1
+            return True
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+
+    def submit(self, request: TTSRequest) -> Future:
+        """Queue a request on this shard; the caller must have acquired a slot"""
+        try:
+            self.start()
+            try:
+                future = self._pool.submit(_shard_synthesize, request.model_dump())
+            except BrokenProcessPool:
+                # The process died (e.g. killed for memory); replace it and retry once
+                print(f"TTS shard {self.name} died, restarting")
+                self.shutdown()
+                self.start()
+                future = self._pool.submit(_shard_synthesize, request.model_dump())
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def to_dict(self) -> dict:
+        started = self._started
+        return {
+            "name": self.name,
+            "language": self.language,
+            "cpus": self.cpus,
+            "state": self.state(),
+            "given_up": self.given_up,
+            "pid": started.result() if self.state() == "ready" else None,
+            "queue_depth": self._pending,
+            "queue_size": self.max_pending,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            if self._retry is not None:
+                self._retry.cancel()
+                self._retry = None
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+                self._started = None
+
+
+class ShardRouter:
+    """Routes synthesis to per-language shard processes.
+
+    Each language gets ``replicas`` shards; a request goes to the replica of
+    its language with the shortest queue, and is refused with QueueFullError
+    once every replica's queue is full.
+    """
+
+    def __init__(self, replicas: Dict[str, int], cpus: Dict[str, List[int]], max_pending: int,
+                 languages: List[str]):
+        self.shards: Dict[str, List[Shard]] = {}
+        available = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") \
+            else list(range(os.cpu_count() or 1))
+        reserved = {cpu for language in cpus for cpu in cpus[language]}
+        shared = [cpu for cpu in available if cpu not in reserved] or available
+
+        # Languages without explicit cores split what's left evenly between their shards
+        unpinned = [(language, replica) for language in languages if language not in cpus
+                    for replica in range(replicas.get(language, 1))]
+        per_shard = max(len(shared) // max(len(unpinned), 1), 1)
+        assigned = {
+            shard: [shared[(index * per_shard + offset) % len(shared)] for offset in range(per_shard)]
+            for index, shard in enumerate(unpinned)
+        }
+
+        for language in languages:
+            count = replicas.get(language, 1)
+            self.shards[language] = []
+            for replica in range(count):
+                if language in cpus:
+                    own = cpus[language]
+                    # Replicas of a pinned language split its cores between them
+                    shard_cpus = own[replica::count] or own
+                else:
+                    shard_cpus = assigned[(language, replica)]
+                self.shards[language].append(Shard(language, replica, shard_cpus, max_pending))
+
+    def start(self):
+        for shard in self.all_shards():
+            shard.start()
+
+    def all_shards(self) -> List[Shard]:
+        return [shard for shards in self.shards.values() for shard in shards]
+
+    def submit(self, request: TTSRequest) -> Future:
+        language = request.language.lower()
+        if language not in self.shards:
+            raise ValueError(f"TTS model not available for {language}")
+        for shard in sorted(self.shards[language], key=lambda s: s.depth):
+            if shard.try_acquire():
+                metrics.inc("tts_shard_requests", shard=shard.name)
+                return shard.submit(request)
+        metrics.inc("tts_shard_rejected", language=language)
+        raise QueueFullError(f"TTS queue for {language} is full")
+
+    def synthesize(self, request: dict) -> dict:
+        """Render a request on its language's shard and wait for the result"""
+        return self.submit(TTSRequest(**request)).result()
+
+    def is_ready(self) -> bool:
+        """Every shard is serving or has been given up on (reported, not waited for)"""
+        return all(shard.state() == "ready" or shard.given_up for shard in self.all_shards())
+
+    def status(self) -> List[dict]:
+        return [shard.to_dict() for shard in self.all_shards()]
+
+    def shutdown(self):
+        for shard in self.all_shards():
+            shard.shutdown()
+
+
+# The router of the shard host process (see ShardHost)
+_host_router: Optional[ShardRouter] = None
+
+
+def _start_host_router():
+    global _host_router
+    _host_router = ShardRouter(
+        replicas=settings.TTS_SHARD_REPLICAS,
+        cpus=settings.TTS_SHARD_CPUS,
+        max_pending=settings.TTS_SHARD_QUEUE_SIZE,
+        languages=list(settings.TTS_MODEL_MAP),
+    )
+    _host_router.start()
+    atexit.register(_host_router.shutdown)
+
+
+def _get_host_router() -> ShardRouter:
+    return _host_router
+
+
+class ShardManager(BaseManager):
+    pass
+
+
+ShardManager.register("router", callable=_get_host_router, exposed=("synthesize", "is_ready", "status"))
+
+
+class ShardHost(ProcessHost):
+    """The server's one ShardRouter, shared by all of its workers (see ``ProcessHost``)"""
+
+    def __init__(self):
+        super().__init__("shards", "app.services.tts_shards", ShardManager, "router")
+
+    def synthesize(self, request: TTSRequest) -> dict:
+        return self.proxy().synthesize(request.model_dump())
+
+    def is_ready(self) -> bool:
+        try:
+            return self.proxy().is_ready()
+        except (OSError, EOFError, RuntimeError):
+            return False
+
+    def status(self) -> List[dict]:
+        if not self.started:
+            return []
+        try:
+            return self.proxy().status()
+        except (OSError, EOFError):
+            return []
+
+
+shard_host = ShardHost()
+
+
+if __name__ == "__main__":
+    _start_host_router()
+    serve(ShardManager, sys.argv[1])
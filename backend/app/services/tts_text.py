@@ -0,0 +1,12 @@
+import re
+from typing import List
+
+# Sentence ends at terminal punctuation (optionally followed by closing quotes or
+# brackets) and whitespace, or at a line break
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])\s+|(?<=[.!?…][\"')\]])\s+|\n+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences suitable for synthesizing one at a time"""
+    sentences = [part.strip() for part in _SENTENCE_BOUNDARY.split(text)]
+    return [sentence for sentence in sentences if sentence]
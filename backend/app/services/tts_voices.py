@@ -0,0 +1,64 @@
+import hashlib
+import os
+import threading
+import uuid
+from typing import Dict, Optional
+import numpy as np
+
+
+class VoiceBank:
+    """Speaker embeddings for the named voices of multi-speaker models (your_tts).
+
+    Each voice is a reference clip. Its embedding is computed with the
+    model's speaker encoder once, saved as ``.npy`` under ``directory`` (keyed
+    by model and clip content, so replacing a clip recomputes it) and
+    registered with the model's speaker manager. Requests then select the
+    voice by name and the model reuses the stored embedding instead of
+    encoding the clip on every call.
+    """
+
+    def __init__(self, voices: Dict[str, Dict[str, str]], directory: str):
+        self.voices = voices  # language -> voice name -> reference clip path
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def speaker(self, model, model_name: str, language: str, voice: Optional[str]) -> str:
+        """Speaker name to pass to the model, registering the voice's embedding on first use"""
+        manager = model.synthesizer.tts_model.speaker_manager
+        if voice is None:
+            # No configured voices: fall back to the model's first built-in speaker
+            return model.speakers[0]
+        with self._lock:
+            if voice not in manager.embeddings_by_names:
+                embedding = self._embedding(manager, model_name, voice, self.voices[language][voice])
+                manager.embeddings_by_names[voice] = [embedding]
+                manager.embeddings[f"voice:{voice}"] = {"name": voice, "embedding": embedding}
+        return voice
+
+    def prepare(self, model, model_name: str, language: str) -> None:
+        """Compute and register every configured voice of a language up front"""
+        for voice in self.voices.get(language, {}):
+            try:
+                self.speaker(model, model_name, language, voice)
+            except Exception as e:
+                print(f"Failed to prepare voice {voice} for {language}: {e}")
+
+    def _embedding(self, manager, model_name: str, voice: str, clip_path: str) -> np.ndarray:
+        with open(clip_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:16]
+        path = os.path.join(self.directory, model_name.replace("/", "--"), f"{voice}.{digest}.npy")
+        if os.path.exists(path):
+            return np.load(path)
+
+        embedding = np.asarray(manager.compute_embedding_from_clip(clip_path), dtype=np.float32)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.save(f, embedding)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to save speaker embedding for {voice}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return embedding
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Database load test for the async course routes
+Serves the app with a single uvicorn worker and hits the course endpoints from
+many concurrent clients, once through the async engine (the real routes) and
+once through the same queries on the blocking sync session inside ``async
+def`` handlers, as the routes were before. A /health probe runs alongside to
+show how long the event loop is stalled:
+
+    python benchmarks/db_load_test.py --concurrency 32 --requests 50
+
+Runs against a scratch SQLite database by default; pass --database-url with a
+throwaway Postgres database to measure the real driver and network round trips.
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.tts_benchmark import git_revision  # noqa: E402
+
+VARIANTS = {"blocking": "/blocking/courses", "async": "/courses"}
+EMAIL = "load-test@example.com"
+
+
+def blocking_router():
+    """The pre-async versions of the read routes: ``async def`` handlers calling the sync session"""
+    from typing import List
+    from fastapi import APIRouter, Depends, HTTPException
+    from fastapi.security import OAuth2PasswordBearer
+    from jose import jwt
+    from sqlalchemy.orm import Session
+    from app.core.config import settings
+    from app.core.database import get_db
+    from app.models.lesson import Course, Lesson, Module
+    from app.models.user import User
+    from app.schemas.course import CourseResponse, LessonResponse, ModuleResponse
+
+    router = APIRouter(prefix="/blocking/courses")
+    oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+
+    async def current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+        email = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("sub")
+        user = db.query(User).filter(User.email == email).first()
+        if user is None:
+            raise HTTPException(status_code=401)
+        return user
+
+    @router.get("/", response_model=List[CourseResponse])
+    async def get_courses(current_user: User = Depends(current_user), db: Session = Depends(get_db)):
+        return db.query(Course).filter(Course.is_active == True).all()  # noqa: E712
+
+    @router.get("/{course_id}", response_model=CourseResponse)
+    async def get_course(course_id: int, current_user: User = Depends(current_user), db: Session = Depends(get_db)):
+        return db.query(Course).filter(Course.id == course_id).first()
+
+    @router.get("/{course_id}/modules", response_model=List[ModuleResponse])
+    async def get_modules(course_id: int, current_user: User = Depends(current_user), db: Session = Depends(get_db)):
+        return db.query(Module).filter(Module.course_id == course_id).order_by(Module.order_index).all()
+
+    @router.get("/modules/{module_id}/lessons", response_model=List[LessonResponse])
+    async def get_lessons(module_id: int, current_user: User = Depends(current_user), db: Session = Depends(get_db)):
+        return db.query(Lesson).filter(Lesson.module_id == module_id).order_by(Lesson.order_index).all()
+
+    return router
+
+
+def serve(port: int):
+    """Run the app, plus the blocking routes, in this process (the server side of the test)"""
+    import uvicorn
+    from app.main import app
+    app.include_router(blocking_router())
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", workers=1)
+
+
+def seed(courses: int, modules: int, lessons: int) -> list:
+    """Create the schema and a small catalogue; returns (course id, module ids) pairs"""
+    from app.core.database import Base, SessionLocal, engine
+    from app.models import audio, lesson as lesson_models, quiz, user  # noqa: F401 (register tables)
+    from app.models.lesson import Course, Lesson, Module
+    from app.models.user import User
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if db.query(User).filter(User.email == EMAIL).first() is None:
+            db.add(User(username="load-test", email=EMAIL, hashed_password="!", is_active=True))
+        catalogue = []
+        for c in range(courses):
+            course = Course(title=f"Course {c}", language="english", category="load-test")
+            db.add(course)
+            db.flush()
+            module_ids = []
+            for m in range(modules):
+                module = Module(title=f"Module {m}", order_index=m, course_id=course.id)
+                db.add(module)
+                db.flush()
+                module_ids.append(module.id)
+                db.add_all(Lesson(title=f"Lesson {n}", content="Slow down near schools.", language="english",
+                                  order_index=n, module_id=module.id) for n in range(lessons))
+            catalogue.append((course.id, module_ids))
+        db.commit()
+        return catalogue
+    finally:
+        db.close()
+
+
+def token() -> str:
+    from datetime import timedelta
+    from app.api.auth import create_access_token
+    return create_access_token({"sub": EMAIL}, expires_delta=timedelta(hours=1))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def get(url: str, headers=None) -> float:
+    start = time.perf_counter()
+    with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {}), timeout=60) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def wait_for(url: str, server: subprocess.Popen, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            get(url)
+            return
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with status {server.returncode}")
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def percentiles(latencies) -> dict:
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        if not ordered:
+            return None
+        return ordered[min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)] * 1000
+
+    return {"count": len(ordered), "p50_ms": percentile(50), "p90_ms": percentile(90),
+            "p99_ms": percentile(99), "max_ms": percentile(100)}
+
+
+def run_variant(base_url: str, prefix: str, catalogue: list, args, headers: dict) -> dict:
+    """Concurrent clients walking the catalogue while a probe polls /health"""
+    paths = [f"{prefix}/"]
+    for course_id, module_ids in catalogue:
+        paths += [f"{prefix}/{course_id}", f"{prefix}/{course_id}/modules"]
+        paths += [f"{prefix}/modules/{module_id}/lessons" for module_id in module_ids]
+
+    probe, stop = [], threading.Event()
+
+    def poll_health():
+        while not stop.is_set():
+            probe.append(get(f"{base_url}/health"))
+            time.sleep(args.probe_interval)
+
+    def client(index: int):
+        return [get(base_url + paths[(index + i) % len(paths)], headers) for i in range(args.requests)]
+
+    prober = threading.Thread(target=poll_health, daemon=True)
+    prober.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = [latency for result in pool.map(client, range(args.concurrency)) for latency in result]
+    wall_time = time.perf_counter() - start
+    stop.set()
+    prober.join()
+
+    return {
+        "requests": percentiles(latencies),
+        "health_probe": percentiles(probe),
+        "throughput_rps": len(latencies) / wall_time,
+        "wall_time_seconds": wall_time,
+    }
+
+
+def print_report(results: dict):
+    print(f"\n{'variant':<10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'req/s':>8} {'health p99':>11}")
+    for variant, row in results.items():
+        requests = row["requests"]
+        print(f"{variant:<10} {requests['p50_ms']:>8.1f} {requests['p99_ms']:>8.1f} {requests['max_ms']:>8.1f} "
+              f"{row['throughput_rps']:>8.0f} {row['health_probe']['p99_ms']:>10.1f}ms")
+    if {"blocking", "async"} <= results.keys():
+        before, after = results["blocking"]["requests"]["p99_ms"], results["async"]["requests"]["p99_ms"]
+        print(f"\np99 {before:.1f}ms -> {after:.1f}ms ({(after - before) / before * 100:+.1f}%)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the course routes on the sync and async engines")
+    parser.add_argument("--database-url", help="Throwaway database to use instead of a scratch SQLite file")
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS))
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per client and variant")
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--modules", type=int, default=3, help="Modules per course")
+    parser.add_argument("--lessons", type=int, default=5, help="Lessons per module")
+    parser.add_argument("--probe-interval", type=float, default=0.01, help="Seconds between /health probes")
+    parser.add_argument("--output", default="db_load_test.json")
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.serve:
+        return serve(args.serve)
+
+    with tempfile.TemporaryDirectory(prefix="db-load-test-") as workdir:
+        # Set before the app is imported; the server process inherits it
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(workdir, 'load_test.db')}"
+        os.environ["AUDIO_OUTPUT_DIR"] = os.path.join(workdir, "audio")
+        os.environ["TTS_BACKEND"] = "fake"
+        os.environ["TTS_PRERENDER_ENABLED"] = "false"
+        os.environ["TTS_WARMUP_ON_STARTUP"] = "false"
+
+        catalogue = seed(args.courses, args.modules, args.lessons)
+        headers = {"Authorization": f"Bearer {token()}"}
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", str(port)],
+                                  cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        try:
+            wait_for(f"{base_url}/health", server)
+            print(f"🏁 {args.concurrency} clients x {args.requests} requests against {base_url}...")
+            results = {}
+            for variant in args.variants:
+                # One untimed pass so connection pools and caches are warm for both variants
+                run_variant(base_url, VARIANTS[variant], catalogue, argparse.Namespace(**{**vars(args), "requests": 2}),
+                            headers)
+                results[variant] = run_variant(base_url, VARIANTS[variant], catalogue, args, headers)
+        finally:
+            server.terminate()
+            server.wait()
+
+    print_report(results)
+    report = {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "database": "postgresql" if args.database_url else "sqlite",
+            "concurrency": args.concurrency,
+            "requests_per_client": args.requests,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Float vs int8 comparison for the Coqui TTS models
+Loads each language's model twice, as shipped and with dynamic int8
+quantization (TTS_QUANTIZE), synthesizes the same sentences with both and
+reports speed (real-time factor), weight size and how far the quantized
+audio drifts from the original:
+
+    python benchmarks/quantization_report.py --threads 4
+
+Pass --audio-dir to also keep both renderings of every sentence for listening.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.tts_benchmark import SENTENCE, git_revision  # noqa: E402
+
+SENTENCES = {
+    "english": [
+        SENTENCE["english"].strip(),
+        "Keep a safe distance from the vehicle in front of you.",
+        "Slow down near schools, hospitals and pedestrian crossings.",
+    ],
+    "french": [
+        SENTENCE["french"].strip(),
+        "Gardez une distance de sécurité avec le véhicule qui vous précède.",
+        "Ralentissez près des écoles, des hôpitaux et des passages piétons.",
+    ],
+    "kinyarwanda": [
+        SENTENCE["kinyarwanda"].strip(),
+        "Gabanya umuvuduko hafi y'amashuri n'ibitaro.",
+    ],
+}
+RTF_TARGET = 1.0
+
+
+def log_spectrogram(samples: np.ndarray, n_fft: int = 1024, hop: int = 256) -> np.ndarray:
+    samples = np.asarray(samples, dtype=np.float64)
+    if len(samples) < n_fft:
+        samples = np.pad(samples, (0, n_fft - len(samples)))
+    count = 1 + (len(samples) - n_fft) // hop
+    frames = np.lib.stride_tricks.sliding_window_view(samples, n_fft)[::hop][:count] * np.hanning(n_fft)
+    spectrum = 10 * np.log10(np.abs(np.fft.rfft(frames, axis=1)) ** 2 + 1e-10)
+    # An 80 dB floor keeps near-silent bins from dominating the distance
+    return np.maximum(spectrum, spectrum.max() - 80)
+
+
+def spectral_distance(reference: np.ndarray, other: np.ndarray) -> float:
+    """Mean log-spectral distance in dB between two renderings, aligned with DTW.
+
+    Alignment matters because autoregressive models can stretch or shorten
+    a rendering slightly; comparing frame i to frame i would mostly measure
+    that drift rather than any change in the sound itself.
+    """
+    a, b = log_spectrogram(reference), log_spectrogram(other)
+    squared = (a ** 2).sum(1)[:, None] + (b ** 2).sum(1)[None, :] - 2 * a @ b.T
+    cost = np.sqrt(np.maximum(squared, 0) / a.shape[1])
+
+    n, m = cost.shape
+    total = np.full((n + 1, m + 1), np.inf)
+    steps = np.zeros((n + 1, m + 1))
+    total[0, 0] = 0
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            moves = ((total[i - 1, j - 1], steps[i - 1, j - 1]),
+                     (total[i - 1, j], steps[i - 1, j]),
+                     (total[i, j - 1], steps[i, j - 1]))
+            best, length = min(moves)
+            total[i, j] = best + cost[i - 1, j - 1]
+            steps[i, j] = length + 1
+    return float(total[n, m] / steps[n, m])
+
+
+def weights_bytes(model) -> int:
+    """Serialized size of the model's torch modules (quantized weights are packed, not parameters)"""
+    import torch
+    from app.services.tts_models import _torch_modules
+    buffer = io.BytesIO()
+    torch.save([module.state_dict() for module in _torch_modules(model)], buffer)
+    return buffer.tell()
+
+
+def render(model, sentences, audio_dir=None, prefix=""):
+    from app.services.tts_models import inference_mode
+    sample_rate = model.synthesizer.output_sample_rate
+    outputs, compute, audio = [], 0.0, 0.0
+    for index, sentence in enumerate(sentences):
+        start = time.perf_counter()
+        with inference_mode():
+            samples = np.asarray(model.tts(text=sentence), dtype=np.float32)
+        compute += time.perf_counter() - start
+        audio += len(samples) / sample_rate
+        outputs.append(samples)
+        if audio_dir:
+            from app.services.audio_utils import write_audio
+            write_audio(os.path.join(audio_dir, f"{prefix}-{index}.wav"), samples, sample_rate)
+    return outputs, {
+        "compute_seconds": compute,
+        "audio_seconds": audio,
+        "real_time_factor": compute / audio if audio else None,
+    }
+
+
+def compare_language(language: str, model_name: str, args) -> dict:
+    from app.services.tts_models import load_coqui_model
+
+    sentences = SENTENCES.get(language, SENTENCES["english"])
+    report = {"language": language, "model_name": model_name}
+    outputs = {}
+    for variant, quantize in (("float32", False), ("int8", True)):
+        start = time.perf_counter()
+        model = load_coqui_model(model_name, quantize=quantize, threads=args.threads)
+        load_time = time.perf_counter() - start
+        # One throwaway call so lazy initialisation isn't billed to the first sentence
+        render(model, sentences[:1])
+        outputs[variant], stats = render(model, sentences * args.repeats, args.audio_dir, f"{language}-{variant}")
+        stats.update({"load_seconds": load_time, "weights_bytes": weights_bytes(model)})
+        report[variant] = stats
+        del model
+
+    pairs = list(zip(outputs["float32"], outputs["int8"]))[:len(sentences)]
+    distances = [spectral_distance(reference, quantized) for reference, quantized in pairs]
+    ratios = [len(quantized) / len(reference) for reference, quantized in pairs if len(reference)]
+    report["quality"] = {
+        "spectral_distance_db_mean": float(np.mean(distances)),
+        "spectral_distance_db_max": float(np.max(distances)),
+        "duration_ratio_mean": float(np.mean(ratios)),
+    }
+    report["speedup"] = report["float32"]["real_time_factor"] / report["int8"]["real_time_factor"]
+    report["meets_rtf_target"] = report["int8"]["real_time_factor"] < RTF_TARGET
+    return report
+
+
+def print_report(results):
+    print(f"\n{'language':<12} {'rtf f32':>8} {'rtf int8':>9} {'speedup':>8} {'MiB f32':>8} {'MiB int8':>9} "
+          f"{'LSD dB':>7} {'dur':>6}")
+    for row in results:
+        mib = 1024 * 1024
+        print(f"{row['language']:<12} {row['float32']['real_time_factor']:>8.2f} {row['int8']['real_time_factor']:>9.2f} "
+              f"{row['speedup']:>7.2f}x {row['float32']['weights_bytes'] / mib:>8.0f} "
+              f"{row['int8']['weights_bytes'] / mib:>9.0f} {row['quality']['spectral_distance_db_mean']:>7.2f} "
+              f"{row['quality']['duration_ratio_mean']:>6.2f}"
+              f"{'' if row['meets_rtf_target'] else '  (int8 RTF above target)'}")
+
+
+def parse_args(argv=None):
+    from app.core.config import settings
+    parser = argparse.ArgumentParser(description="Compare float and int8-quantized TTS models")
+    parser.add_argument("--languages", nargs="+", default=list(settings.TTS_MODEL_MAP))
+    parser.add_argument("--threads", type=int, default=settings.TTS_TORCH_THREADS or 4,
+                        help="Intra-op torch threads, as configured per worker")
+    parser.add_argument("--repeats", type=int, default=2, help="Passes over the sentence list for timing")
+    parser.add_argument("--audio-dir", help="Keep both renderings of every sentence here")
+    parser.add_argument("--output", default="tts_benchmark_quantization.json")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from app.core.config import settings
+    args = parse_args(argv)
+    if args.audio_dir:
+        os.makedirs(args.audio_dir, exist_ok=True)
+
+    print(f"🏁 Comparing float32 and int8 TTS models with {args.threads} threads...")
+    results = [
+        compare_language(language, settings.TTS_MODEL_MAP[language], args)
+        for language in args.languages if language in settings.TTS_MODEL_MAP
+    ]
+    print_report(results)
+
+    report = {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "threads": args.threads,
+            "rtf_target": RTF_TARGET,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+TTS benchmark harness for Road Safety Learning Platform
+Measures latency percentiles, throughput and memory of TTSService for single,
+batch and concurrent synthesis across text lengths and languages.
+
+By default it runs fully offline against the deterministic fake model backend
+on a throwaway SQLite database, so results are comparable between releases:
+
+    python benchmarks/tts_benchmark.py --output results.json
+    python benchmarks/tts_benchmark.py --output new.json --compare results.json
+
+Use --backend coqui to benchmark the real models instead.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SENTENCE = {
+    "english": "Always look both ways before crossing the road and wait for the green signal. ",
+    "french": "Regardez toujours des deux côtés avant de traverser et attendez le feu vert. ",
+    "kinyarwanda": "Buri gihe reba impande zombi mbere yo kwambuka umuhanda kandi utegereze itara ry'icyatsi. ",
+}
+TEXT_LENGTHS = {"short": 1, "medium": 4, "long": 16}  # Sentences per text
+
+
+def configure_environment(args, workdir: str):
+    """Point the app at a scratch database and audio directory before it is imported"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'benchmark.db')}"
+    os.environ["AUDIO_OUTPUT_DIR"] = os.path.join(workdir, "audio")
+    os.environ["TTS_BACKEND"] = args.backend
+    os.environ["TTS_PRERENDER_ENABLED"] = "false"
+    if args.backend == "fake":
+        os.environ["TTS_BACKEND_OPTIONS"] = json.dumps({
+            "real_time_factor": args.rtf,
+            "memory_bytes": args.fake_model_mb * 1024 * 1024,
+        })
+    for key, value in (args.env or []):
+        os.environ[key] = value
+
+
+def summarize(latencies, items: int, wall_time: float, audio_seconds: float) -> dict:
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        if not ordered:
+            return None
+        index = min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[index]
+
+    return {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered) if ordered else None,
+        "p50": percentile(50),
+        "p90": percentile(90),
+        "p99": percentile(99),
+        "max": ordered[-1] if ordered else None,
+        "items_per_second": items / wall_time if wall_time else None,
+        "audio_seconds_per_second": audio_seconds / wall_time if wall_time else None,
+        "real_time_factor": wall_time / audio_seconds if audio_seconds else None,
+    }
+
+
+class Benchmark:
+    def __init__(self, args):
+        from app.core.database import Base, SessionLocal, engine
+        from app.models.audio import AudioFile  # noqa: F401 - registers the table
+        from app.services.tts_service import TTSService
+
+        Base.metadata.create_all(bind=engine, tables=[AudioFile.__table__])
+        self.args = args
+        self.SessionLocal = SessionLocal
+        self.service = TTSService()
+        self.counter = 0
+
+    def text(self, language: str, length: str) -> str:
+        # Numbering every sentence keeps each call a miss in both the audio and phrase caches
+        self.counter += 1
+        base = SENTENCE[language].strip().rstrip(".")
+        return " ".join(f"{base} {self.counter}-{i}." for i in range(TEXT_LENGTHS[length]))
+
+    def request(self, language: str, length: str):
+        from app.schemas.tts import TTSRequest
+        return TTSRequest(text=self.text(language, length), language=language)
+
+    def audio_seconds(self, response) -> float:
+        return response.duration or 0.0
+
+    def warm_up(self, languages):
+        db = self.SessionLocal()
+        try:
+            for language in languages:
+                self.service.synthesize(self.request(language, "short"), db)
+        finally:
+            db.close()
+
+    def single(self, language: str, length: str) -> dict:
+        db = self.SessionLocal()
+        latencies, audio = [], 0.0
+        try:
+            start = time.perf_counter()
+            for _ in range(self.args.iterations):
+                t0 = time.perf_counter()
+                response = self.service.synthesize(self.request(language, length), db)
+                latencies.append(time.perf_counter() - t0)
+                audio += self.audio_seconds(response)
+            wall = time.perf_counter() - start
+        finally:
+            db.close()
+        return summarize(latencies, len(latencies), wall, audio)
+
+    def cached(self, language: str, length: str) -> dict:
+        db = self.SessionLocal()
+        latencies = []
+        try:
+            request = self.request(language, length)
+            self.service.synthesize(request, db)
+            start = time.perf_counter()
+            for _ in range(self.args.iterations):
+                t0 = time.perf_counter()
+                self.service.synthesize(request, db)
+                latencies.append(time.perf_counter() - t0)
+            wall = time.perf_counter() - start
+        finally:
+            db.close()
+        return summarize(latencies, len(latencies), wall, 0.0)
+
+    def batch(self, language: str, length: str) -> dict:
+        db = self.SessionLocal()
+        latencies, audio, items = [], 0.0, 0
+        try:
+            start = time.perf_counter()
+            for _ in range(max(self.args.iterations // self.args.batch_size, 1)):
+                requests = [self.request(language, length) for _ in range(self.args.batch_size)]
+                t0 = time.perf_counter()
+                results = self.service.synthesize_batch(requests, db)
+                latencies.append(time.perf_counter() - t0)
+                for result, error in results:
+                    if error:
+                        raise RuntimeError(error)
+                    audio += self.audio_seconds(result)
+                    items += 1
+            wall = time.perf_counter() - start
+        finally:
+            db.close()
+        return summarize(latencies, items, wall, audio)
+
+    def concurrent(self, language: str, length: str) -> dict:
+        requests = [self.request(language, length) for _ in range(self.args.iterations)]
+
+        def run(request):
+            db = self.SessionLocal()
+            try:
+                t0 = time.perf_counter()
+                response = self.service.synthesize(request, db)
+                return time.perf_counter() - t0, self.audio_seconds(response)
+            finally:
+                db.close()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.args.concurrency) as pool:
+            outcomes = list(pool.map(run, requests))
+        wall = time.perf_counter() - start
+        return summarize([o[0] for o in outcomes], len(outcomes), wall, sum(o[1] for o in outcomes))
+
+
+def run_benchmarks(args) -> dict:
+    from app.core.metrics import metrics
+    bench = Benchmark(args)
+    bench.warm_up(args.languages)
+
+    results = []
+    for language in args.languages:
+        for length in args.lengths:
+            for scenario in args.scenarios:
+                if args.trace_memory:
+                    tracemalloc.start()
+                stats = getattr(bench, scenario)(language, length)
+                peak = None
+                if args.trace_memory:
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                stats.update({
+                    "scenario": scenario,
+                    "language": language,
+                    "length": length,
+                    "python_peak_bytes": peak,
+                    "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+                })
+                results.append(stats)
+                print(f"  {scenario:<10} {language:<12} {length:<6} "
+                      f"p50={stats['p50'] * 1000:8.1f}ms p99={stats['p99'] * 1000:8.1f}ms "
+                      f"{stats['items_per_second']:7.2f} items/s")
+
+    return {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "backend": args.backend,
+            "fake_real_time_factor": args.rtf if args.backend == "fake" else None,
+            "iterations": args.iterations,
+            "batch_size": args.batch_size,
+            "concurrency": args.concurrency,
+            "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+            "loaded_models": bench.service.registry.loaded(),
+        },
+        "results": results,
+        # Per-language stage timings and real-time factor across the whole run
+        "histograms": metrics.snapshot()["histograms"],
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict):
+    """Print p50/p99 and throughput changes against an earlier results file"""
+    def key(row):
+        return row["scenario"], row["language"], row["length"]
+
+    previous = {key(row): row for row in baseline["results"]}
+    print(f"\nCompared with {baseline['metadata'].get('git_revision')} ({baseline['metadata'].get('timestamp')}):")
+    for row in current["results"]:
+        old = previous.get(key(row))
+        if not old:
+            continue
+        changes = []
+        for metric in ("p50", "p99", "items_per_second"):
+            if old.get(metric) and row.get(metric) is not None:
+                changes.append(f"{metric} {(row[metric] - old[metric]) / old[metric] * 100:+6.1f}%")
+        print(f"  {' '.join(key(row)):<32} " + "  ".join(changes))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark TTS synthesis")
+    parser.add_argument("--backend", choices=["fake", "coqui"], default="fake")
+    parser.add_argument("--rtf", type=float, default=0.2, help="Real-time factor of the fake model")
+    parser.add_argument("--fake-model-mb", type=int, default=0, help="Simulated weight size of the fake model")
+    parser.add_argument("--languages", nargs="+", default=list(SENTENCE))
+    parser.add_argument("--lengths", nargs="+", choices=list(TEXT_LENGTHS), default=list(TEXT_LENGTHS))
+    parser.add_argument("--scenarios", nargs="+", choices=["single", "cached", "batch", "concurrent"],
+                        default=["single", "cached", "batch", "concurrent"])
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--env", nargs=2, action="append", metavar=("KEY", "VALUE"),
+                        help="Extra settings override, e.g. --env TTS_SENTENCE_PAUSE_MS 100")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record peak Python allocations per scenario (slows synthesis down)")
+    parser.add_argument("--output", default="tts_benchmark.json")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="tts-bench-") as workdir:
+        configure_environment(args, workdir)
+        print(f"🏁 Benchmarking TTS ({args.backend} backend)...")
+        report = run_benchmarks(args)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+    return report
+
+
+if __name__ == "__main__":
+    main()
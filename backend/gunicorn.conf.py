@@ -0,0 +1,70 @@
+"""
+Gunicorn configuration for production.
+
+The app is imported once in the master (preload_app) and TTS models are
+loaded there before any worker forks, so every worker shares the same
+model weight pages copy-on-write instead of holding its own copy:
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+With TTS_SHARDED_WORKERS the master starts the shard processes instead,
+once for all workers, and loads no models itself. It also starts the one
+TTS job host (and its synthesis processes) that all workers queue jobs on.
+
+Check how much of each worker is shared with:
+
+    python -m app.core.memory <master pid>
+"""
+
+import gc
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+
+def when_ready(server):
+    from app.api.tts import tts_service
+    from app.core.config import settings
+    from app.services.tts_jobs import job_host
+    from app.services.tts_shards import shard_host
+
+    if settings.TTS_SHARDED_WORKERS:
+        # Models live in the shard processes only; start them once for all workers forked below
+        server.log.info("Starting TTS shard processes")
+        shard_host.start()
+    else:
+        # Loads only; the warm-up inference runs in each worker once it starts
+        languages = tts_service.preload_languages()
+        server.log.info(f"Preloading TTS models: {', '.join(languages)}")
+        tts_service.registry.preload(languages)
+    # The job pool is shared by all workers too, so jobs are bounded per server
+    server.log.info("Starting TTS job host")
+    job_host.start()
+    # Move everything allocated so far out of the collector's generations so
+    # collections in the workers don't write to (and un-share) those pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from app.core.config import settings
+    from app.core.database import sync_engines
+    from app.core.replicas import replicas
+    from app.services.tts_models import set_torch_threads
+
+    # Connections opened by the master must not be reused across processes
+    for engine in sync_engines() + replicas.sync_engines():
+        engine.dispose(close=False)
+    # Re-applied per worker since OpenMP thread pools don't survive fork
+    set_torch_threads(settings.TTS_TORCH_THREADS)
+
+
+def on_exit(server):
+    from app.services.tts_jobs import job_host
+    from app.services.tts_shards import shard_host
+
+    job_host.shutdown()
+    shard_host.shutdown()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Pre-render script for Road Safety Learning Platform
+Voices every active lesson and quiz question ahead of time
+
+Runs are incremental and resumable: text that already has audio for the
+current model version is skipped, so an interrupted run picks up where it
+stopped and a model upgrade (see TTS_MODEL_REVISIONS) re-renders only stale
+items.
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.audio import AudioFile
+from app.models.lesson import Lesson
+from app.models.quiz import Quiz, QuizQuestion
+from app.services.prerender_service import PrerenderService
+from app.services.tts_service import TTSService
+
+
+def iter_pages(query, id_column, page_size, row_id=lambda row: row.id):
+    """Yield pages in primary key order without OFFSET, so each page is a cheap index range"""
+    last_id = 0
+    while True:
+        rows = query.filter(id_column > last_id).order_by(id_column).limit(page_size).all()
+        if not rows:
+            return
+        yield rows
+        last_id = row_id(rows[-1])
+
+
+def render(db: Session, service: TTSService, requests, dry_run: bool):
+    """Render the uncached requests of one page, returning (rendered, failed)"""
+    missing = PrerenderService.missing(db, requests)
+    if dry_run or not missing:
+        return len(missing), 0
+    failed = 0
+    for request, (result, error) in zip(missing, service.synthesize_batch(missing, db)):
+        if error:
+            failed += 1
+            print(f"  ❌ {request.language}: {error} ({request.text[:40]!r})")
+    return len(missing) - failed, failed
+
+
+def backfill(page_size: int, language: str = None, dry_run: bool = False):
+    db = SessionLocal()
+    service = TTSService()
+    rendered = failed = 0
+
+    try:
+        print("🔊 Pre-rendering lessons...")
+        lessons = db.query(Lesson).filter(Lesson.is_active == True)
+        if language:
+            lessons = lessons.filter(Lesson.language == language)
+        for page in iter_pages(lessons, Lesson.id, page_size):
+            requests = [r for lesson in page for r in PrerenderService.lesson_requests(lesson)]
+            done, errors = render(db, service, requests, dry_run)
+            rendered, failed = rendered + done, failed + errors
+            print(f"  lessons up to id {page[-1].id}: {done} rendered")
+
+        print("🔊 Pre-rendering quiz questions...")
+        questions = db.query(QuizQuestion, Quiz.language).join(Quiz).filter(QuizQuestion.is_active == True)
+        if language:
+            questions = questions.filter(Quiz.language == language)
+        for page in iter_pages(questions, QuizQuestion.id, page_size, row_id=lambda row: row[0].id):
+            requests = [
+                r for question, question_language in page
+                for r in PrerenderService.question_requests(question, question_language)
+            ]
+            done, errors = render(db, service, requests, dry_run)
+            rendered, failed = rendered + done, failed + errors
+            print(f"  questions up to id {page[-1][0].id}: {done} rendered")
+
+        current_versions = [TTSService.model_version(lang) for lang in settings.TTS_MODEL_MAP]
+        stale = db.query(AudioFile).filter(
+            AudioFile.model_version.isnot(None),
+            AudioFile.model_version.notin_(current_versions)
+        ).count()
+    finally:
+        db.close()
+
+    verb = "would be rendered" if dry_run else "rendered"
+    print(f"✅ {rendered} audio files {verb}, {failed} failed, {stale} stale files from older models")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-render lesson and quiz audio")
+    parser.add_argument("--language", help="Only render this language")
+    parser.add_argument("--page-size", type=int, default=50, help="Items rendered and committed per page")
+    parser.add_argument("--dry-run", action="store_true", help="Only count what would be rendered")
+    parser.add_argument("--nice", type=int, default=10,
+                        help="Lower the CPU priority by this much, so web workers on the same host go first")
+    args = parser.parse_args()
+    if args.nice:
+        os.nice(args.nice)
+    ok = backfill(page_size=args.page_size, language=args.language, dry_run=args.dry_run)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Query plan regression test for the hot lookup paths
+Seeds a large catalogue with progress, enrollments and quiz responses, then
+asks the database how it would run each hot query, and fails if any of them
+falls back to a sequential scan of its table:
+
+    pytest test_query_plans.py
+    QUERY_PLAN_DATABASE_URL=postgresql://postgres:pw@localhost:5432/plans_test pytest test_query_plans.py
+
+Uses a scratch SQLite file by default, with the schema created from the models.
+On Postgres the schema is built by the Alembic migrations, so the indexes they
+create are the ones tested. QUERY_PLAN_DATABASE_URL must point at a throwaway
+database: its public schema is dropped and recreated.
+QUERY_PLAN_SCALE multiplies the seeded row counts (default 1).
+"""
+
+import os
+import random
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, func, select  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+from sqlalchemy.sql.expression import ClauseElement, Executable  # noqa: E402
+
+DATABASE_URL = os.environ.get("QUERY_PLAN_DATABASE_URL")
+SCALE = float(os.environ.get("QUERY_PLAN_SCALE", "1"))
+WORKDIR = tempfile.mkdtemp(prefix="query-plans-")
+# The app creates its engines on import; keep them off any real database
+os.environ.setdefault("DATABASE_URL", DATABASE_URL or f"sqlite:///{os.path.join(WORKDIR, 'app.db')}")
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+
+app_database = pytest.importorskip("app.core.database")
+from app.models.lesson import Course, CourseEnrollment, Lesson, Module, UserProgress  # noqa: E402
+from app.models.quiz import Quiz, QuizQuestion, QuizResponse  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+HOT_TABLES = {"user_progress", "course_enrollments", "lessons", "modules", "quiz_questions", "quiz_responses"}
+COUNTS = {
+    "users": int(2000 * SCALE),
+    "courses": int(40 * SCALE),
+    "modules_per_course": 10,
+    "lessons_per_module": 10,
+    "progress_per_user": 25,
+    "enrollments_per_user": 5,
+    "questions_per_quiz": 20,
+    "responses": int(100000 * SCALE),
+}
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN of a statement, compiled with the statement's own parameters and types"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _explain_postgresql(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+@compiles(Explain, "sqlite")
+def _explain_sqlite(element, compiler, **kw):
+    return "EXPLAIN QUERY PLAN " + compiler.process(element.statement, **kw)
+
+
+def create_schema(engine):
+    """Postgres: run the migrations; SQLite, which they don't support: create the tables from the models"""
+    if engine.dialect.name != "postgresql":
+        app_database.Base.metadata.drop_all(engine)
+        app_database.Base.metadata.create_all(engine)
+        return
+    from alembic import command
+    from alembic.config import Config
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP SCHEMA public CASCADE")
+        connection.exec_driver_sql("CREATE SCHEMA public")
+    # Alembic manages the transactions itself: the index migration builds indexes concurrently
+    with engine.connect() as connection:
+        config = Config()
+        config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+
+def seed(engine):
+    """Create the schema and fill it"""
+    rng = random.Random(42)
+    create_schema(engine)
+    now = datetime.now(timezone.utc)
+
+    users = [{"id": i + 1, "username": f"user{i}", "email": f"user{i}@example.com", "hashed_password": "!",
+              "is_active": True} for i in range(COUNTS["users"])]
+    courses = [{"id": i + 1, "title": f"Course {i}", "language": "english", "is_active": True}
+               for i in range(COUNTS["courses"])]
+    modules = [{"id": c * COUNTS["modules_per_course"] + m + 1, "course_id": c + 1,
+                "title": f"Module {m}", "order_index": m, "is_active": rng.random() > 0.1}
+               for c in range(len(courses)) for m in range(COUNTS["modules_per_course"])]
+    lessons = [{"id": index * COUNTS["lessons_per_module"] + n + 1, "module_id": module["id"],
+                "title": f"Lesson {n}", "content": "Slow down near schools.", "language": "english",
+                "order_index": n, "is_active": rng.random() > 0.1}
+               for index, module in enumerate(modules) for n in range(COUNTS["lessons_per_module"])]
+    progress = [{"user_id": user["id"], "lesson_id": lesson_id, "completed": rng.random() > 0.5}
+                for user in users
+                for lesson_id in rng.sample(range(1, len(lessons) + 1), COUNTS["progress_per_user"])]
+    enrollments = [{"user_id": user["id"], "course_id": course_id}
+                   for user in users
+                   for course_id in rng.sample(range(1, len(courses) + 1), min(COUNTS["enrollments_per_user"],
+                                                                              len(courses)))]
+    quizzes = [{"id": index + 1, "lesson_id": lesson["id"], "title": f"Quiz {index}", "language": "english",
+                "is_active": True} for index, lesson in enumerate(lessons[::10])]
+    questions = [{"id": q * COUNTS["questions_per_quiz"] + n + 1, "quiz_id": quiz["id"],
+                  "question_text": "Who has right of way?", "options": ["A", "B"], "correct_answer_index": 0,
+                  "is_active": rng.random() > 0.1}
+                 for q, quiz in enumerate(quizzes) for n in range(COUNTS["questions_per_quiz"])]
+    # Two years of answers, so a week of them is a small slice
+    responses = [{"question_id": rng.randint(1, len(questions)), "user_id": rng.randint(1, len(users)),
+                  "user_answer_index": 0, "is_correct": rng.random() > 0.3,
+                  "created_at": now - timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))}
+                 for _ in range(COUNTS["responses"])]
+
+    with engine.begin() as connection:
+        for model, rows in ((User, users), (Course, courses), (Module, modules), (Lesson, lessons),
+                            (UserProgress, progress), (CourseEnrollment, enrollments), (Quiz, quizzes),
+                            (QuizQuestion, questions), (QuizResponse, responses)):
+            connection.execute(model.__table__.insert(), rows)
+
+    # Planner statistics, as autovacuum would have them on a live database
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql("VACUUM ANALYZE" if engine.dialect.name == "postgresql" else "ANALYZE")
+
+
+def hot_queries() -> dict:
+    """The queries behind the learner-facing endpoints and the recent-activity reports"""
+    week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+    return {
+        "lesson progress": select(UserProgress).where(UserProgress.user_id == 17, UserProgress.lesson_id == 42),
+        "user progress": select(UserProgress).where(UserProgress.user_id == 17),
+        "course enrollment": select(CourseEnrollment).where(
+            CourseEnrollment.user_id == 17, CourseEnrollment.course_id == 3),
+        "user enrollments": select(CourseEnrollment).where(CourseEnrollment.user_id == 17),
+        "course modules": select(Module).where(
+            Module.course_id == 3, Module.is_active == True).order_by(Module.order_index),  # noqa: E712
+        "module lessons": select(Lesson).where(
+            Lesson.module_id == 42, Lesson.is_active == True).order_by(Lesson.order_index),  # noqa: E712
+        "quiz questions": select(QuizQuestion).where(
+            QuizQuestion.quiz_id == 7, QuizQuestion.is_active == True),  # noqa: E712
+        "recent quiz responses": select(func.count()).select_from(
+            select(QuizResponse).where(QuizResponse.created_at >= week_ago).subquery()),
+    }
+
+
+def sequential_scans(connection, statement) -> list:
+    """Hot tables the database would read in full to answer ``statement``"""
+    rows = connection.execute(Explain(statement)).all()
+    if connection.dialect.name == "postgresql":
+        scans, nodes = [], [rows[0][0][0]["Plan"]]
+        while nodes:
+            node = nodes.pop()
+            if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in HOT_TABLES:
+                scans.append(node["Relation Name"])
+            nodes.extend(node.get("Plans", []))
+        return scans
+    # SQLite: "SEARCH <table> USING INDEX ..." is a lookup, "SCAN <table>" reads it all
+    return [match.group(1) for *_, detail in rows
+            if (match := re.match(r"SCAN (\w+)", detail)) and match.group(1) in HOT_TABLES]
+
+
+@pytest.fixture(scope="module")
+def connection():
+    engine = create_engine(DATABASE_URL or f"sqlite:///{os.path.join(WORKDIR, 'plans.db')}")
+    try:
+        seed(engine)
+    except sqlalchemy.exc.OperationalError as e:
+        pytest.skip(f"Query plan database unavailable: {e}")
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", list(hot_queries()))
+def test_hot_query_uses_an_index(connection, name):
+    scans = sequential_scans(connection, hot_queries()[name])
+    assert not scans, f"{name} scans {', '.join(scans)} sequentially"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
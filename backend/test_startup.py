@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Startup budget test
+Imports the app in fresh interpreters, as each worker does when it spawns, and
+fails if the import gets slower than the budget, pulls in a heavy subsystem
+that should load on first use, or touches the database or the filesystem:
+
+    pytest test_startup.py
+    STARTUP_IMPORT_BUDGET_SECONDS=3 pytest test_startup.py
+
+The budget defaults to 2.5 seconds (about 1.3s measured on one CPU core);
+raise it on slow CI machines. On failure the slowest modules are listed, from
+``python -X importtime``.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGET_SECONDS = float(os.environ.get("STARTUP_IMPORT_BUDGET_SECONDS", "2.5"))
+RUNS = 3
+# Loaded on first use: model synthesis, PDF extraction, resampling, the migration check
+LAZY_MODULES = ["TTS", "torch", "PyPDF2", "scipy", "alembic"]
+
+IMPORT_APP = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+print(json.dumps({"seconds": time.perf_counter() - start, "modules": sorted(sys.modules)}))
+"""
+
+
+def import_app(workdir: str, *options) -> subprocess.CompletedProcess:
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'startup.db')}",
+        "AUDIO_OUTPUT_DIR": os.path.join(workdir, "audio"),
+    }
+    env.pop("ASYNC_DATABASE_URL", None)
+    return subprocess.run([sys.executable, *options, "-c", IMPORT_APP], cwd=BACKEND_DIR, env=env,
+                          capture_output=True, text=True, check=True)
+
+
+def slowest_imports(importtime_output: str, count: int = 10) -> str:
+    """The modules with the most import time of their own, from ``-X importtime`` output"""
+    rows = []
+    for line in importtime_output.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            own, _, module = line[len("import time:"):].split("|")
+            if own.strip().isdigit():
+                rows.append((int(own), module.strip()))
+    return "\n".join(f"  {own / 1000:8.1f}ms  {module}" for own, module in sorted(rows, reverse=True)[:count])
+
+
+@pytest.fixture(scope="module")
+def startup():
+    with tempfile.TemporaryDirectory(prefix="startup-") as workdir:
+        runs = [json.loads(import_app(workdir).stdout) for _ in range(RUNS)]
+        yield {
+            "seconds": min(run["seconds"] for run in runs),
+            "modules": set(runs[-1]["modules"]),
+            "created": sorted(os.listdir(workdir)),
+            "workdir": workdir,
+        }
+
+
+def test_import_time_within_budget(startup):
+    if startup["seconds"] > BUDGET_SECONDS:
+        report = slowest_imports(import_app(startup["workdir"], "-X", "importtime").stderr)
+        pytest.fail(f"Importing app.main took {startup['seconds']:.2f}s, budget {BUDGET_SECONDS:.2f}s. "
+                    f"Slowest modules:\n{report}")
+
+
+@pytest.mark.parametrize("module", LAZY_MODULES)
+def test_heavy_module_not_imported(startup, module):
+    assert module not in startup["modules"], f"app.main imports {module} at startup"
+
+
+def test_import_has_no_side_effects(startup):
+    # No database file (no create_all or queries) and no audio directories
+    assert startup["created"] == []
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -7,6 +7,8 @@ import type {
 } from '../types';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+// Set by the API after a write: until then our reads must skip read replicas to see it
+const PRIMARY_UNTIL_HEADER = 'X-DB-Primary-Until';
 
 class ApiService {
   private api: AxiosInstance;
@@ -27,6 +29,10 @@ class ApiService {
         if (token) {
           config.headers.Authorization = `Bearer ${token}`;
         }
+        const primaryUntil = Number(localStorage.getItem('dbPrimaryUntil'));
+        if (primaryUntil > Date.now() / 1000) {
+          config.headers[PRIMARY_UNTIL_HEADER] = String(primaryUntil);
+        }
         return config;
       },
       (error) => {
@@ -36,7 +42,13 @@ class ApiService {
 
     // Response interceptor
     this.api.interceptors.response.use(
-      (response) => response,
+      (response) => {
+        const primaryUntil = response.headers[PRIMARY_UNTIL_HEADER.toLowerCase()];
+        if (primaryUntil) {
+          localStorage.setItem('dbPrimaryUntil', primaryUntil);
+        }
+        return response;
+      },
       (error) => {
         if (error.response?.status === 401) {
           // Handle unauthorized access
@@ -197,6 +197,10 @@ export interface TTSRequest {
   language: string;
   voice_speed?: number;
   voice_pitch?: number;
+  voice?: string;
+  output_format?: 'wav' | 'flac' | 'ogg';
+  sample_rate?: number;
+  keep_original?: boolean;
 }
 
 export interface TTSResponse {
@@ -204,6 +208,8 @@ export interface TTSResponse {
   filename: string;
   duration?: number;
   file_size?: number;
+  generation_time?: number;
+  cached?: boolean;
 }
 
 // WebSocket message types